@@ -1,43 +1,434 @@
 """
 Document Processor Agent using LangChain for document ingestion and preprocessing.
 """
-from typing import List, Dict, Any, Optional
+import math
+import os
+import threading
+import time
+import zipfile
+from itertools import accumulate, chain, islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import List, Dict, Any, Iterator, Optional
+from functools import lru_cache
 from pathlib import Path
+from xml.etree import ElementTree
 from loguru import logger
-from langchain_community.document_loaders import TextLoader, PyPDFLoader, Docx2txtLoader, UnstructuredHTMLLoader
+from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import BedrockEmbeddings
-from langchain_community.vectorstores import OpenSearchVectorSearch
 from config.settings import settings
+from utils.clients import get_embeddings, get_vectorstore
+from utils.embedding_cache import EmbeddingCache, chunk_id, content_hash
+
+
+_SUPPORTED_EXTENSIONS = {'.txt', '.pdf', '.docx', '.html', '.htm'}
+
+# WordprocessingML namespace used in word/document.xml
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# PDFium is not thread-safe; single files are parsed inline on API worker threads.
+_PDFIUM_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _pdfium():
+    """Import the native PDFium backend once; ``None`` when it is not installed."""
+    try:
+        import pypdfium2
+        return pypdfium2
+    except ImportError:
+        logger.warning("pypdfium2 not installed, falling back to pypdf for PDF extraction")
+        return None
+
+
+def _load_pdf(file_path: str) -> List[Document]:
+    """Extract one document per PDF page.
+
+    PDFium opens the file itself and reads objects on demand, so the PDF is never
+    buffered whole in Python and resident memory stays flat regardless of size.
+    All PDFium calls hold ``_PDFIUM_LOCK``; worker processes each have their own.
+    """
+    pdfium = _pdfium()
+    if pdfium is None:
+        from langchain_community.document_loaders import PyPDFLoader
+        return PyPDFLoader(file_path).load()
+    docs = []
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(Path(file_path))
+        try:
+            for page_number, page in enumerate(pdf):
+                textpage = page.get_textpage()
+                docs.append(Document(
+                    page_content=textpage.get_text_range(),
+                    metadata={"source": file_path, "page": page_number}
+                ))
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+    return docs
+
+
+def _load_docx(file_path: str) -> List[Document]:
+    """Stream paragraphs out of ``word/document.xml`` without building the whole document tree."""
+    paragraphs, runs = [], []
+    in_properties = 0  # inside w:pPr, where w:tab defines tab stops rather than tab characters
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+        for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+            if elem.tag == _W + "pPr":
+                in_properties += 1 if event == "start" else -1
+            elif event == "start":
+                continue
+            elif elem.tag == _W + "t":
+                runs.append(elem.text or "")
+            elif elem.tag == _W + "tab" and not in_properties:
+                runs.append("\t")
+            elif elem.tag in (_W + "br", _W + "cr"):
+                runs.append("\n")
+            elif elem.tag == _W + "p":
+                paragraphs.append("".join(runs))
+                runs = []
+                elem.clear()
+    return [Document(page_content="\n".join(paragraphs), metadata={"source": file_path})]
+
+
+# Elements whose contents are code or fallback markup, not document text
+_NON_TEXT_TAGS = ("script", "style", "noscript", "template")
+
+
+@lru_cache(maxsize=1)
+def _html_to_text():
+    """Pick the fastest installed HTML text extractor once: selectolax, then BeautifulSoup with lxml or html.parser."""
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        LexborHTMLParser = None
+    if LexborHTMLParser is not None:
+        def extract(html: bytes) -> str:
+            tree = LexborHTMLParser(html)
+            tree.strip_tags(list(_NON_TEXT_TAGS))
+            node = tree.body or tree.root
+            return node.text(separator="\n", strip=True) if node else ""
+        return extract
+    try:
+        import lxml  # noqa: F401
+        features = 'lxml'
+    except ImportError:
+        features = 'html.parser'
+    logger.warning(f"selectolax not installed, falling back to BeautifulSoup ({features}) for HTML extraction")
+    from bs4 import BeautifulSoup
+
+    def extract(html: bytes) -> str:
+        soup = BeautifulSoup(html, features)
+        for node in soup(_NON_TEXT_TAGS):
+            node.decompose()
+        return soup.get_text(separator="\n", strip=True)
+    return extract
+
+
+def _load_html(file_path: str) -> List[Document]:
+    """Extract the visible text of an HTML file, joining text nodes with newlines in one pass."""
+    with open(file_path, 'rb') as f:
+        text = _html_to_text()(f.read())
+    return [Document(page_content=text, metadata={"source": file_path})]
+
+
+def _load_document(file_path: str, source_name: str):
+    """Load document using LangChain loaders."""
+    ext = Path(file_path).suffix.lower()
+    if ext == '.txt':
+        from langchain_community.document_loaders import TextLoader
+        docs = TextLoader(file_path, encoding='utf-8').load()
+    elif ext == '.pdf':
+        docs = _load_pdf(file_path)
+    elif ext == '.docx':
+        docs = _load_docx(file_path)
+    elif ext in ['.html', '.htm']:
+        docs = _load_html(file_path)
+    else:
+        raise ValueError(f"Unsupported file type: {ext}")
+    for doc in docs:
+        doc.metadata['source'] = source_name
+    return docs
+
+
+@lru_cache(maxsize=1)
+def _text_splitter() -> RecursiveCharacterTextSplitter:
+    """Build the text splitter once per process."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=settings.chunk_size,
+        chunk_overlap=settings.chunk_overlap
+    )
+
+
+def _knn_index_mapping(dimension: int) -> Dict[str, Any]:
+    """HNSW k-NN mapping built from the ``hnsw_*`` settings.
+
+    Field names match ``OpenSearchVectorSearch`` so LangChain retrieval works
+    against the index unchanged. With ``opensearch_fp16_vectors`` the faiss
+    engine stores vectors with fp16 scalar quantization. ``hnsw_ef_search`` is
+    baked into faiss (method parameter) and nmslib (index setting) indexes; the
+    lucene engine ignores both and only takes ``ef_search`` per query.
+    """
+    engine = "faiss" if settings.opensearch_fp16_vectors else settings.hnsw_engine
+    parameters = {"m": settings.hnsw_m, "ef_construction": settings.hnsw_ef_construction}
+    index_settings = {"knn": True}
+    if engine == "faiss":
+        parameters["ef_search"] = settings.hnsw_ef_search
+    elif engine == "nmslib":
+        index_settings["knn.algo_param.ef_search"] = settings.hnsw_ef_search
+    if settings.opensearch_fp16_vectors:
+        parameters["encoder"] = {"name": "sq", "parameters": {"type": "fp16"}}
+    return {
+        "settings": {"index": index_settings},
+        "mappings": {
+            "properties": {
+                "metadata": {"properties": {"file_path": {"type": "keyword"}}},
+                "vector_field": {
+                    "type": "knn_vector",
+                    "dimension": dimension,
+                    "method": {
+                        "name": "hnsw",
+                        "space_type": settings.hnsw_space_type,
+                        "engine": engine,
+                        "parameters": parameters
+                    }
+                }
+            }
+        }
+    }
+
+
+def parse_and_chunk(file_path: str, source_name: str):
+    """Load and chunk a file. Module-level so it can run in a worker process."""
+    docs = _load_document(file_path, source_name)
+    if not docs:
+        raise ValueError("No content loaded from file.")
+    return _text_splitter().split_documents(docs)
+
 
 class DocumentProcessorAgent:
     """Agent responsible for processing documents and preparing them for RAG using LangChain."""
     def __init__(self):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.chunk_size,
-            chunk_overlap=settings.chunk_overlap
-        )
-        self.embeddings = BedrockEmbeddings()
-        self.vectorstore = OpenSearchVectorSearch(
-            opensearch_url=settings.opensearch_url,
-            index_name=settings.opensearch_index,
-            embedding_function=self.embeddings,
-            http_auth=(settings.opensearch_user, settings.opensearch_password),
-            use_ssl=settings.opensearch_use_ssl,
-            verify_certs=settings.opensearch_verify_certs
+        self.text_splitter = _text_splitter()
+        self.embeddings = get_embeddings()
+        self.vectorstore = get_vectorstore()
+        self.embedding_cache = (
+            EmbeddingCache(settings.embedding_cache_path, model_id=settings.bedrock_embedding_model_id)
+            if settings.embedding_cache_path else None
         )
+        self._stats_cache = None  # (monotonic timestamp, stats)
+        self._index_ready = False
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
         logger.info("LangChain-based Document Processor Agent initialized")
 
     def process_file(self, file_path: str, source_name: str = None) -> Dict[str, Any]:
         """Process a single file and return processing results using LangChain."""
-        if source_name is None:
-            source_name = Path(file_path).name
+        return self.process_files_batched([file_path], [source_name])[0]
+
+    def process_files_batched(self, file_paths: List[str], source_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Process several files with a single batched embedding pass.
+
+        Files are parsed and chunked first, all chunks are embedded together, and
+        the vectors are scattered back per file for indexing. Results are returned
+        in input order.
+        """
+        sources = [
+            (source_names[i] if source_names and i < len(source_names) and source_names[i] else Path(fp).name)
+            for i, fp in enumerate(file_paths)
+        ]
+        results: Dict[int, Dict[str, Any]] = {}
+        parsed = []
+        for idx, outcome in self._parse_files(file_paths, sources):
+            if isinstance(outcome, Exception):
+                results[idx] = self._failure(file_paths[idx], sources[idx], outcome)
+            else:
+                parsed.append((idx, outcome))
+        if parsed:
+            results.update(self.index_chunks(parsed, file_paths, sources))
+            self._stats_cache = None
+        return [results[i] for i in range(len(file_paths))]
+
+    def index_chunks(self, parsed, file_paths: List[str], sources: List[str]) -> Dict[int, Dict[str, Any]]:
+        """Embed and index ``(idx, splits)`` pairs produced by :func:`parse_and_chunk`.
+
+        Chunks from every file are flattened into one buffer and embedded in a
+        single batched pass; the vectors are sliced back per file by offset
+        before indexing. Returns results keyed by input index.
+        """
+        flat = list(chain.from_iterable(splits for _, splits in parsed))
+        hashes = [content_hash(split.page_content) for split in flat]
+        for split, digest in zip(flat, hashes):
+            split.metadata["chunk_hash"] = digest.hex()
+        try:
+            embeddings = self._embed_chunks([split.page_content for split in flat], hashes)
+        except Exception as e:
+            return {idx: self._failure(file_paths[idx], sources[idx], e) for idx, _ in parsed}
+        offsets = list(accumulate((len(splits) for _, splits in parsed), initial=0))
+        jobs = [
+            (idx, splits, embeddings[offsets[i]:offsets[i + 1]])
+            for i, (idx, splits) in enumerate(parsed)
+        ]
+        results = self._index_files(jobs, file_paths, sources)
+        if any(result["success"] for result in results.values()):
+            try:
+                self.vectorstore.client.indices.refresh(index=self.vectorstore.index_name)
+            except Exception as e:
+                logger.warning(f"Index refresh failed: {e}")
+        return results
+
+    def process_directory(self, directory_path: str) -> List[Dict[str, Any]]:
+        """Process all supported files in a directory using LangChain loaders."""
         try:
-            docs = self._load_document(file_path, source_name)
-            if not docs:
-                raise ValueError("No content loaded from file.")
-            splits = self.text_splitter.split_documents(docs)
-            self.vectorstore.add_documents(splits)
+            return list(self.process_directory_iter(directory_path))
+        except Exception as e:
+            logger.error(f"Error processing directory {directory_path}: {e}")
+            return []
+
+    def process_directory_iter(self, directory_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield per-file results while walking a directory.
+
+        Files are discovered lazily and processed ``settings.ingest_batch_files``
+        at a time, so memory stays bounded and results arrive as each batch is
+        indexed.
+        """
+        directory = Path(directory_path)
+        if not directory.exists():
+            raise FileNotFoundError(f"Directory not found: {directory_path}")
+        files = (
+            str(f) for f in directory.rglob('*')
+            if f.suffix.lower() in _SUPPORTED_EXTENSIONS and f.is_file()
+        )
+        successful = failed = 0
+        while True:
+            batch = list(islice(files, settings.ingest_batch_files))
+            if not batch:
+                break
+            # Failures are logged with their error by _failure; successes only at DEBUG.
+            for result in self.process_files_batched(batch):
+                if result["success"]:
+                    successful += 1
+                    logger.debug("Successfully processed: {}", result["file_path"])
+                else:
+                    failed += 1
+                yield result
+        logger.info(f"Processed {directory_path}: {successful} successful, {failed} failed")
+
+    def _parse_files(self, file_paths: List[str], source_names: List[str]):
+        """Yield ``(index, splits_or_exception)`` for each file as parsing completes.
+
+        Parsing is CPU-bound and GIL-limited, so multiple files are spread over a
+        process pool; a single file is parsed inline to skip the pool round-trip.
+        """
+        if len(file_paths) == 1:
+            try:
+                yield 0, parse_and_chunk(file_paths[0], source_names[0])
+            except Exception as e:
+                yield 0, e
+            return
+        pool = self._get_parse_pool()
+        futures = {
+            pool.submit(parse_and_chunk, fp, sn): i
+            for i, (fp, sn) in enumerate(zip(file_paths, source_names))
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except BrokenProcessPool as e:
+                if self._parse_pool is not None:  # a worker died; start a fresh pool next time
+                    self._parse_pool.shutdown(wait=False, cancel_futures=True)
+                    self._parse_pool = None
+                yield futures[future], e
+            except Exception as e:
+                yield futures[future], e
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """Return the agent's parse worker pool, starting it on first use.
+
+        The pool is kept for the agent's lifetime so directory ingestion pays
+        worker start-up once rather than per batch. Workers are spawned, not
+        forked, because this process already runs Bedrock/OpenSearch I/O threads.
+        """
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=settings.ingest_workers or os.cpu_count() or 1,
+                mp_context=get_context("spawn")
+            )
+        return self._parse_pool
+
+    def _embed_chunks(self, texts: List[str], hashes: List[bytes]) -> List[List[float]]:
+        """Embed each distinct chunk once, reusing persisted embeddings for content seen before.
+
+        Identical chunks (repeated headers, footers, disclaimers) share one
+        embedding, which is broadcast back to every position.
+        """
+        unique = dict(zip(hashes, texts))
+        embeddings = self.embedding_cache.get_many(list(unique)) if self.embedding_cache is not None else {}
+        misses = [digest for digest in unique if digest not in embeddings]
+        if misses:
+            fresh = dict(zip(misses, self._embed_texts([unique[digest] for digest in misses])))
+            if self.embedding_cache is not None:
+                self.embedding_cache.put_many(fresh)
+            embeddings.update(fresh)
+        logger.debug(f"Embedded {len(misses)} of {len(texts)} chunks ({len(unique)} distinct)")
+        return [embeddings[digest] for digest in hashes]
+
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in sub-batches spread over ``embedding_concurrency`` threads.
+
+        Titan embeds one text per request and ``embed_documents`` issues those
+        requests serially, so the texts are split evenly across the workers
+        (at most ``embedding_batch_size`` per sub-batch) to keep every worker busy.
+        """
+        batch_size = max(1, min(settings.embedding_batch_size, math.ceil(len(texts) / settings.embedding_concurrency)))
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        if len(batches) <= 1:
+            return self.embeddings.embed_documents(texts) if texts else []
+        with ThreadPoolExecutor(max_workers=min(len(batches), settings.embedding_concurrency)) as pool:
+            return [vector for batch in pool.map(self.embeddings.embed_documents, batches) for vector in batch]
+
+    def _index_files(self, jobs, file_paths: List[str], sources: List[str]) -> Dict[int, Dict[str, Any]]:
+        """Index each file's ``(idx, splits, embeddings)`` job, overlapping the OpenSearch round-trips.
+
+        Indexing is I/O-bound, so up to ``settings.indexing_concurrency`` files are
+        sent from a thread pool; results are keyed by input index.
+        """
+        workers = min(len(jobs), settings.indexing_concurrency)
+        if workers <= 1:
+            return {idx: self._index_splits(splits, embs, file_paths[idx], sources[idx]) for idx, splits, embs in jobs}
+        dimension = next((len(embs[0]) for _, _, embs in jobs if embs), None)
+        if dimension is not None:
+            try:
+                self._ensure_index(dimension)
+            except Exception as e:
+                logger.warning(f"Could not prepare index before parallel indexing: {e}")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(self._index_splits, splits, embs, file_paths[idx], sources[idx]): idx
+                for idx, splits, embs in jobs
+            }
+            return {futures[future]: future.result() for future in as_completed(futures)}
+
+    def _index_splits(self, splits, embeddings: List[List[float]], file_path: str, source_name: str) -> Dict[str, Any]:
+        """Index already-chunked documents with precomputed embeddings.
+
+        Chunk IDs are derived from the resolved file path, so re-ingesting a file
+        overwrites its chunks in place; chunks left over from a longer previous
+        version of the file are deleted afterwards.
+        """
+        try:
+            resolved = str(Path(file_path).resolve())
+            ids = [chunk_id(resolved, i) for i in range(len(splits))]
+            for split in splits:
+                split.metadata["file_path"] = resolved
+            self._bulk_index(
+                ids,
+                [split.page_content for split in splits],
+                embeddings,
+                [split.metadata for split in splits]
+            )
+            self._delete_stale_chunks(resolved, ids)
             return {
                 "success": True,
                 "source": source_name,
@@ -46,69 +437,105 @@ class DocumentProcessorAgent:
                 "metadata": splits[0].metadata if splits else {}
             }
         except Exception as e:
-            logger.error(f"Error processing file {file_path}: {e}")
-            return {
-                "success": False,
-                "source": source_name,
-                "error": str(e),
-                "file_path": file_path
+            return self._failure(file_path, source_name, e)
+
+    def _bulk_index(self, ids: List[str], texts: List[str], embeddings: List[List[float]], metadatas: List[Dict[str, Any]]):
+        """Stream column-wise chunk data to OpenSearch through the bulk helper.
+
+        Actions are generated lazily from the parallel ``ids``/``texts``/
+        ``embeddings``/``metadatas`` columns, so the bulk body is serialized one
+        request at a time instead of materializing a document dict per chunk up
+        front. Documents use the same fields as ``OpenSearchVectorSearch`` so
+        retrieval is unchanged. The index is not refreshed here; callers refresh
+        once after the whole batch.
+        """
+        if not texts:
+            return
+        from opensearchpy.helpers import bulk
+        self._ensure_index(len(embeddings[0]))
+        index_name = self.vectorstore.index_name
+        actions = (
+            {"_op_type": "index", "_index": index_name, "_id": doc_id, "vector_field": vector, "text": text, "metadata": metadata}
+            for doc_id, text, vector, metadata in zip(ids, texts, embeddings, metadatas)
+        )
+        bulk(self.vectorstore.client, actions, chunk_size=500, max_chunk_bytes=1 << 20, refresh=False)
+
+    def _delete_stale_chunks(self, file_path: str, keep_ids: List[str]):
+        """Delete chunks indexed from ``file_path`` other than ``keep_ids``."""
+        # metadata.file_path is a keyword in indexes we create, text + .keyword when dynamically mapped.
+        query = {
+            "bool": {
+                "should": [
+                    {"term": {"metadata.file_path": file_path}},
+                    {"term": {"metadata.file_path.keyword": file_path}}
+                ],
+                "minimum_should_match": 1,
+                "must_not": [{"ids": {"values": keep_ids}}]
             }
+        }
+        self.vectorstore.client.delete_by_query(
+            index=self.vectorstore.index_name, body={"query": query}, conflicts="proceed"
+        )
 
-    def process_directory(self, directory_path: str) -> List[Dict[str, Any]]:
-        """Process all supported files in a directory using LangChain loaders."""
-        results = []
-        supported_extensions = {'.txt', '.pdf', '.docx', '.html', '.htm'}
+    def _ensure_index(self, dimension: int):
+        """Create the k-NN index on first write if it does not exist yet."""
+        if self._index_ready:
+            return
+        from opensearchpy.exceptions import RequestError
+        if not self.vectorstore.index_exists():
+            try:
+                self.vectorstore.client.indices.create(
+                    index=self.vectorstore.index_name, body=_knn_index_mapping(dimension)
+                )
+            except RequestError:
+                pass  # created concurrently by another worker
+        self._index_ready = True
+
+    def warmup_index(self) -> bool:
+        """Load the index's HNSW graphs into OpenSearch native memory ahead of the first search."""
         try:
-            directory = Path(directory_path)
-            if not directory.exists():
-                raise FileNotFoundError(f"Directory not found: {directory_path}")
-            files = [f for f in directory.rglob('*') if f.is_file() and f.suffix.lower() in supported_extensions]
-            logger.info(f"Found {len(files)} files to process in {directory_path}")
-            for file_path in files:
-                result = self.process_file(str(file_path))
-                results.append(result)
-                if result["success"]:
-                    logger.info(f"Successfully processed: {file_path}")
-                else:
-                    logger.error(f"Failed to process: {file_path}")
-            return results
+            self.vectorstore.client.transport.perform_request(
+                "GET", f"/_plugins/_knn/warmup/{self.vectorstore.index_name}"
+            )
+            return True
         except Exception as e:
-            logger.error(f"Error processing directory {directory_path}: {e}")
-            return []
+            logger.warning(f"k-NN warmup failed for index {self.vectorstore.index_name}: {e}")
+            return False
 
-    def _load_document(self, file_path: str, source_name: str):
-        """Load document using LangChain loaders."""
-        ext = Path(file_path).suffix.lower()
-        if ext == '.txt':
-            loader = TextLoader(file_path, encoding='utf-8')
-        elif ext == '.pdf':
-            loader = PyPDFLoader(file_path)
-        elif ext == '.docx':
-            loader = Docx2txtLoader(file_path)
-        elif ext in ['.html', '.htm']:
-            loader = UnstructuredHTMLLoader(file_path)
-        else:
-            raise ValueError(f"Unsupported file type: {ext}")
-        docs = loader.load()
-        for doc in docs:
-            doc.metadata['source'] = source_name
-        return docs
+    def _failure(self, file_path: str, source_name: str, error: Exception) -> Dict[str, Any]:
+        logger.error(f"Error processing file {file_path}: {error}")
+        return {
+            "success": False,
+            "source": source_name,
+            "error": str(error),
+            "file_path": file_path
+        }
 
     def remove_source(self, source_name: str) -> bool:
         """Remove all documents from a specific source using vectorstore delete."""
         # This assumes the vectorstore supports deletion by metadata
         try:
             self.vectorstore.delete(filter={"source": source_name})
+            self._stats_cache = None
             return True
         except Exception as e:
             logger.error(f"Error removing source {source_name}: {e}")
             return False
 
     def get_processing_stats(self) -> Dict[str, Any]:
-        """Get statistics about processed documents from vectorstore."""
+        """Get statistics about processed documents from vectorstore.
+
+        The count is cached for ``stats_ttl_s`` seconds and invalidated whenever
+        this agent indexes or removes documents.
+        """
+        cached = self._stats_cache
+        if cached is not None and time.monotonic() - cached[0] < settings.stats_ttl_s:
+            return cached[1]
         try:
-            stats = self.vectorstore._client.count(index=settings.opensearch_index)
-            return {"total_documents": stats['count']}
+            stats = self.vectorstore.client.count(index=self.vectorstore.index_name)
+            result = {"total_documents": stats['count']}
+            self._stats_cache = (time.monotonic(), result)
+            return result
         except Exception as e:
             logger.error(f"Error getting processing stats: {e}")
             return {"error": str(e)} 
\ No newline at end of file
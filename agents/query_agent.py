@@ -1,54 +1,97 @@
 """
 Query Agent using LangChain for handling user queries and generating RAG responses.
 """
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from loguru import logger
-from langchain_community.embeddings import BedrockEmbeddings
-from langchain_community.vectorstores import OpenSearchVectorSearch
 from langchain.chains import RetrievalQA
 from langchain_core.prompts import PromptTemplate
 from config.settings import settings
+from utils.clients import get_embeddings, get_llm, get_vectorstore
+from utils.query_cache import QueryCache
+
+_INTENT_KEYWORDS = {
+    "is_question": ["what", "how", "why", "when", "where", "who", "?"],
+    "is_definition": ["what is", "define", "definition"],
+    "is_explanation": ["explain", "how does", "tell me about"],
+    "is_comparison": ["compare", "difference", "vs", "versus"],
+    "is_example": ["example", "instance", "case"],
+    "has_technical_terms": ["api", "function", "method", "class", "algorithm"],
+}
+# A keyword implies every intent with a keyword it contains ("what is" -> is_question),
+# so taking only the longest keyword at each position still finds every intent.
+_KEYWORD_INTENTS = {
+    keyword: frozenset(name for name, words in _INTENT_KEYWORDS.items() if any(w in keyword for w in words))
+    for words in _INTENT_KEYWORDS.values() for keyword in words
+}
+# Zero-width lookahead so overlapping keywords are all seen in a single scan of the query.
+_INTENT_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_KEYWORD_INTENTS, key=len, reverse=True)) + "))"
+)
+_SUGGESTION_TEMPLATES = (
+    "What is {}?",
+    "Explain {}",
+    "How does {} work?",
+    "Tell me about {}",
+    "Examples of {}",
+)
 
 class QueryAgent:
     """Agent responsible for processing queries and generating RAG responses using LangChain."""
     def __init__(self):
-        self.embeddings = BedrockEmbeddings()
-        self.vectorstore = OpenSearchVectorSearch(
-            opensearch_url=settings.opensearch_url,
-            index_name=settings.opensearch_index,
-            embedding_function=self.embeddings,
-            http_auth=(settings.opensearch_user, settings.opensearch_password),
-            use_ssl=settings.opensearch_use_ssl,
-            verify_certs=settings.opensearch_verify_certs
-        )
-        self.qa_chain = RetrievalQA.from_chain_type(
-            llm=self.embeddings.llm,
-            chain_type="stuff",
-            retriever=self.vectorstore.as_retriever(search_kwargs={"k": settings.top_k}),
+        self.embeddings = get_embeddings()
+        self.vectorstore = get_vectorstore()
+        self.llm = get_llm()
+        self._qa_chains: Dict[int, RetrievalQA] = {}
+        self.qa_chain = self._get_qa_chain(settings.top_k)
+        self.response_cache = QueryCache(
+            max_size=settings.query_cache_size,
+            ttl_s=settings.query_cache_ttl_s,
+            threshold=settings.query_cache_similarity_threshold,
+            quantization=settings.embedding_quantization
         )
         logger.info("LangChain-based Query Agent initialized")
 
-    def process_query(self, query: str, top_k: int = 5, include_sources: bool = True) -> Dict[str, Any]:
-        """Process a user query and return a RAG response using LangChain."""
+    def process_query(self, query: str, top_k: int = 5, include_sources: bool = True, no_cache: bool = False) -> Dict[str, Any]:
+        """Process a user query and return a RAG response using LangChain.
+
+        Responses are cached by query embedding, so repeated or near-duplicate
+        questions are answered without another retrieval and LLM call. Pass
+        ``no_cache=True`` to bypass the cache.
+        """
         try:
-            retriever = self.vectorstore.as_retriever(search_kwargs={"k": top_k})
-            result = self.qa_chain.run(query, retriever=retriever)
+            embedding = None
+            namespace = (self.vectorstore.index_name, top_k, include_sources)
+            generation = self.response_cache.generation
+            if not no_cache:
+                cached = self.response_cache.get_exact(query, namespace)
+                if cached is None:
+                    embedding = self.embeddings.embed_query(query)
+                    cached = self.response_cache.get(embedding, namespace)
+                if cached is not None:
+                    return {**cached, "query": query}
+            output = self._get_qa_chain(top_k)({"query": query})
+            result = output["result"]
             sources = []
             if include_sources:
-                docs = retriever.get_relevant_documents(query)
-                for doc in docs:
+                for doc in output["source_documents"]:
                     sources.append({
                         "content": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
                         "source": doc.metadata.get("source", "unknown"),
                         "metadata": doc.metadata
                     })
-            return {
+            response = {
                 "success": True,
                 "response": result,
                 "sources": sources,
                 "query": query,
                 "num_sources": len(sources)
             }
+            if embedding is not None:
+                self.response_cache.put(embedding, response, namespace, key=query, generation=generation)
+            return response
         except Exception as e:
             logger.error(f"Error processing query: {e}")
             return {
@@ -58,6 +101,23 @@ class QueryAgent:
                 "query": query
             }
 
+    def _get_qa_chain(self, top_k: int) -> RetrievalQA:
+        """Return the RetrievalQA chain for ``top_k``, building it on first use.
+
+        The chain returns its source documents, so answering and citing share a
+        single vector search.
+        """
+        chain = self._qa_chains.get(top_k)
+        if chain is None:
+            chain = RetrievalQA.from_chain_type(
+                llm=self.llm,
+                chain_type="stuff",
+                retriever=self.vectorstore.as_retriever(search_kwargs={"k": top_k}),
+                return_source_documents=True,
+            )
+            self._qa_chains[top_k] = chain
+        return chain
+
     def process_query_with_context(self, query: str, context: str, top_k: int = 5) -> Dict[str, Any]:
         """Process a query with additional context using LangChain."""
         try:
@@ -75,37 +135,46 @@ class QueryAgent:
 
     def batch_process_queries(self, queries: List[str], top_k: int = 5) -> List[Dict[str, Any]]:
         """Process multiple queries in batch using LangChain."""
-        results = []
-        for query in queries:
-            result = self.process_query(query, top_k)
-            results.append(result)
-            if result["success"]:
-                logger.info(f"Successfully processed query: {query[:50]}...")
-            else:
-                logger.error(f"Failed to process query: {query[:50]}...")
-        return results
+        return asyncio.run(self.abatch_process_queries(queries, top_k))
+
+    async def abatch_process_queries(self, queries: List[str], top_k: int = 5) -> List[Dict[str, Any]]:
+        """Process multiple queries concurrently, at most ``settings.query_concurrency`` at a time.
+
+        Repeated questions in the batch are answered once. Retrieval and generation
+        are blocking calls, so they run on a thread pool sized to the concurrency
+        cap rather than the event loop's default executor.
+        """
+        unique = list(dict.fromkeys(queries))
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max(1, min(len(unique), settings.query_concurrency))) as pool:
+            answers = await asyncio.gather(*(self._process_query_async(loop, pool, query, top_k) for query in unique))
+        by_query = dict(zip(unique, answers))
+        return [by_query[query] for query in queries]
+
+    async def _process_query_async(self, loop, pool: ThreadPoolExecutor, query: str, top_k: int) -> Dict[str, Any]:
+        result = await loop.run_in_executor(pool, self.process_query, query, top_k)
+        if result["success"]:
+            logger.info(f"Successfully processed query: {query[:50]}...")
+        else:
+            logger.error(f"Failed to process query: {query[:50]}...")
+        return result
 
     def get_query_suggestions(self, partial_query: str, max_suggestions: int = 5) -> List[str]:
         """Generate query suggestions based on partial input."""
-        suggestions = [
-            f"What is {partial_query}?",
-            f"Explain {partial_query}",
-            f"How does {partial_query} work?",
-            f"Tell me about {partial_query}",
-            f"Examples of {partial_query}"
-        ]
-        return suggestions[:max_suggestions]
+        return [template.format(partial_query) for template in _SUGGESTION_TEMPLATES[:max_suggestions]]
 
     def analyze_query_intent(self, query: str) -> Dict[str, Any]:
         """Analyze the intent and type of a query (simple heuristic)."""
-        query_lower = query.lower()
+        found = set()
+        for match in _INTENT_RE.finditer(query.lower()):
+            found |= _KEYWORD_INTENTS[match.group(1)]
         intent = {
-            "is_question": any(word in query_lower for word in ["what", "how", "why", "when", "where", "who", "?"]),
-            "is_definition": any(word in query_lower for word in ["what is", "define", "definition"]),
-            "is_explanation": any(word in query_lower for word in ["explain", "how does", "tell me about"]),
-            "is_comparison": any(word in query_lower for word in ["compare", "difference", "vs", "versus"]),
-            "is_example": any(word in query_lower for word in ["example", "instance", "case"]),
+            "is_question": "is_question" in found,
+            "is_definition": "is_definition" in found,
+            "is_explanation": "is_explanation" in found,
+            "is_comparison": "is_comparison" in found,
+            "is_example": "is_example" in found,
             "query_length": len(query.split()),
-            "has_technical_terms": any(word in query_lower for word in ["api", "function", "method", "class", "algorithm"])
+            "has_technical_terms": "has_technical_terms" in found
         }
         return intent 
\ No newline at end of file
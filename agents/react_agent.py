@@ -3,29 +3,19 @@ ReAct Agent using LangChain's ReAct agent type and tool-calling.
 """
 from langchain.agents import initialize_agent, AgentType
 from langchain.tools import tool
-from langchain_community.embeddings import BedrockEmbeddings
-from langchain_community.vectorstores import OpenSearchVectorSearch
-from langchain.llms.bedrock import BedrockLLM
-from config.settings import settings
+from utils.clients import get_embeddings, get_llm, get_vectorstore
 
 class ReActAgent:
     """Agent that uses ReAct and tool-calling for advanced reasoning and action."""
     def __init__(self):
-        self.embeddings = BedrockEmbeddings()
-        self.vectorstore = OpenSearchVectorSearch(
-            opensearch_url=settings.opensearch_url,
-            index_name=settings.opensearch_index,
-            embedding_function=self.embeddings,
-            http_auth=(settings.opensearch_user, settings.opensearch_password),
-            use_ssl=settings.opensearch_use_ssl,
-            verify_certs=settings.opensearch_verify_certs
-        )
-        self.llm = BedrockLLM()
+        self.embeddings = get_embeddings()
+        self.vectorstore = get_vectorstore()
+        self.llm = get_llm()
         self.tools = [self.search_tool, self.summarize_tool]
         self.agent = initialize_agent(
             self.tools,
             self.llm,
-            agent=AgentType.REACT_DESCRIPTION,
+            agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
             verbose=True,
         )
 
@@ -42,7 +32,7 @@ class ReActAgent:
     def summarize_tool(self, text: str) -> str:
         """Summarize the given text using the LLM."""
         prompt = f"Summarize the following text in 3 sentences:\n\n{text}"
-        return self.llm(prompt)
+        return self.llm.invoke(prompt).content
 
     def run(self, query: str) -> str:
         """Run the ReAct agent on a user query."""
@@ -2,7 +2,7 @@
 Configuration settings for the RAG pipeline.
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 import os
 
 
@@ -17,24 +17,55 @@ class Settings(BaseSettings):
     # Bedrock Configuration
     bedrock_model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0"
     bedrock_embedding_model_id: str = "amazon.titan-embed-text-v1"
+    embedding_batch_size: int = 96  # Most texts one embedding worker handles per task
+    embedding_concurrency: int = 8  # Concurrent Titan requests (one text per request)
     
     # OpenSearch Configuration
     opensearch_host: str = "localhost"
     opensearch_port: int = 9200
     opensearch_username: Optional[str] = None
     opensearch_password: Optional[str] = None
+    opensearch_use_ssl: bool = False  # Connect over HTTPS and verify certificates
     opensearch_index_name: str = "rag_documents"
     opensearch_vector_dimension: int = 1536  # Titan embedding dimension
+    opensearch_fp16_vectors: bool = False  # Store vectors as fp16 (faiss engine, OpenSearch 2.13+)
+    hnsw_engine: str = "faiss"
+    hnsw_space_type: str = "l2"
+    hnsw_m: int = 24
+    hnsw_ef_construction: int = 128
+    hnsw_ef_search: int = 100
+    hnsw_warmup: bool = True  # Preload HNSW graphs into memory during RAGPipeline.warm
     
     # RAG Configuration
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    top_k: int = 5
     max_tokens: int = 4096
     temperature: float = 0.1
     
+    # Ingestion Configuration
+    ingest_workers: Optional[int] = None  # Defaults to os.cpu_count()
+    indexing_concurrency: int = 8  # Files indexed into OpenSearch concurrently
+    ingest_batch_files: int = 64  # Files parsed and embedded together when ingesting a directory
+    embedding_cache_path: Optional[str] = "~/.cache/rag-pipeline/embeddings.sqlite3"  # Empty disables the cache
+    
+    # Query Cache Configuration
+    query_cache_size: int = 2048
+    query_cache_ttl_s: float = 600.0
+    query_cache_similarity_threshold: float = 0.97
+    embedding_quantization: str = "fp32"  # Cached query vectors: fp32, fp16 or int8
+    query_concurrency: int = 16  # Concurrent queries in batch_process_queries
+    
+    # Monitoring
+    stats_ttl_s: float = 5.0
+    health_ttl_s: float = 10.0
+    warm_on_startup: bool = True  # Prime connections when the API server or a CLI repl/shell starts
+    
     # API Configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    api_worker_threads: int = 64  # Threads serving the blocking (sync) endpoints
+    cors_origins: List[str] = ["*"]  # Origins allowed by the API's CORS middleware
     
     # Logging
     log_level: str = "INFO"
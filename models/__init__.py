@@ -4,6 +4,6 @@ Core models for the RAG Pipeline.
 This package contains the main pipeline orchestrator and core models.
 """
 
-from .rag_pipeline import RAGPipeline
+from .rag_pipeline import RAGPipeline, get_pipeline
 
-__all__ = ["RAGPipeline"] 
\ No newline at end of file
+__all__ = ["RAGPipeline", "get_pipeline"] 
\ No newline at end of file
@@ -1,21 +1,53 @@
 """
 Main RAG Pipeline orchestrator using LangChain agents.
 """
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional
 from loguru import logger
-from agents.document_processor_agent import DocumentProcessorAgent
-from agents.query_agent import QueryAgent
-from agents.react_agent import ReActAgent
 from config.settings import settings
 
 class RAGPipeline:
     """Main RAG Pipeline orchestrator using LangChain agents."""
+    __slots__ = ("document_processor", "query_agent", "react_agent", "_health_cache")
+
     def __init__(self):
+        # Imported here so importing this module (for get_pipeline) stays cheap
+        from agents.document_processor_agent import DocumentProcessorAgent
+        from agents.query_agent import QueryAgent
+        from agents.react_agent import ReActAgent
+
         self.document_processor = DocumentProcessorAgent()
         self.query_agent = QueryAgent()
         self.react_agent = ReActAgent()
+        self._health_cache = None  # (monotonic timestamp, healthy status)
         logger.info("LangChain-based RAG Pipeline initialized")
 
+    def start_warming(self):
+        """Run :meth:`warm` on a daemon thread.
+
+        Meant for long-lived entry points (the API server, interactive CLI
+        sessions); one-shot commands would only pay for warm-up they never use.
+        """
+        threading.Thread(target=self.warm, daemon=True).start()
+
+    def warm(self):
+        """Open the Bedrock and OpenSearch connection pools before the first real query.
+
+        Issues one tiny embedding and one mapping fetch, plus the k-NN graph warmup
+        when ``settings.hnsw_warmup`` is set. Errors are logged and ignored.
+        """
+        try:
+            self.query_agent.embeddings.embed_query(".")
+            vectorstore = self.document_processor.vectorstore
+            vectorstore.client.indices.get_mapping(index=vectorstore.index_name)
+        except Exception as e:
+            logger.warning(f"Pipeline warm-up failed: {e}")
+        if settings.hnsw_warmup:
+            self.document_processor.warmup_index()
+
     def ingest_documents(self, file_paths: List[str], source_names: Optional[List[str]] = None) -> Dict[str, Any]:
         results = {
             "total_files": len(file_paths),
@@ -23,21 +55,31 @@ class RAGPipeline:
             "failed": 0,
             "results": []
         }
-        for i, file_path in enumerate(file_paths):
-            source_name = source_names[i] if source_names and i < len(source_names) else None
-            result = self.document_processor.process_file(file_path, source_name)
-            results["results"].append(result)
+        # Failures are logged with their error by the document processor; successes only at DEBUG.
+        results["results"] = self.document_processor.process_files_batched(file_paths, source_names)
+        for result in results["results"]:
             if result["success"]:
                 results["successful"] += 1
-                logger.info(f"Successfully ingested: {file_path}")
+                logger.debug("Successfully ingested: {}", result["file_path"])
             else:
                 results["failed"] += 1
-                logger.error(f"Failed to ingest: {file_path}")
+        if results["successful"]:
+            self.query_agent.response_cache.invalidate()
         logger.info(f"Ingestion completed: {results['successful']} successful, {results['failed']} failed")
         return results
 
     def ingest_directory(self, directory_path: str) -> List[Dict[str, Any]]:
-        return self.document_processor.process_directory(directory_path)
+        results = self.document_processor.process_directory(directory_path)
+        if any(result["success"] for result in results):
+            self.query_agent.response_cache.invalidate()
+        return results
+
+    def ingest_directory_iter(self, directory_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield per-file ingestion results as each batch of the directory is indexed."""
+        for result in self.document_processor.process_directory_iter(directory_path):
+            if result["success"]:
+                self.query_agent.response_cache.invalidate()
+            yield result
 
     def query(self, question: str, top_k: int = 5, include_sources: bool = True, agent_type: str = "rag") -> Dict[str, Any]:
         """Query the pipeline with a question using the specified agent type ('rag' or 'react')."""
@@ -63,7 +105,10 @@ class RAGPipeline:
         return self.query_agent.analyze_query_intent(query)
 
     def remove_source(self, source_name: str) -> bool:
-        return self.document_processor.remove_source(source_name)
+        removed = self.document_processor.remove_source(source_name)
+        if removed:
+            self.query_agent.response_cache.invalidate()
+        return removed
 
     def get_pipeline_stats(self) -> Dict[str, Any]:
         try:
@@ -76,45 +121,72 @@ class RAGPipeline:
                     "chunk_overlap": settings.chunk_overlap,
                     "max_tokens": settings.max_tokens,
                     "temperature": settings.temperature,
-                    "vector_dimension": settings.opensearch_vector_dimension
+                    "vector_dimension": settings.opensearch_vector_dimension,
+                    "hnsw": {
+                        "engine": settings.hnsw_engine,
+                        "space_type": settings.hnsw_space_type,
+                        "m": settings.hnsw_m,
+                        "ef_construction": settings.hnsw_ef_construction,
+                        "ef_search": settings.hnsw_ef_search
+                    }
                 }
             }
         except Exception as e:
             logger.error(f"Error getting pipeline stats: {e}")
             return {"error": str(e)}
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for the response cache and the query-embedding memo."""
+        return {
+            "responses": self.query_agent.response_cache.stats(),
+            "query_embeddings": self.query_agent.embeddings.cache_info()
+        }
+
     def health_check(self) -> Dict[str, Any]:
+        """Probe the vectorstore and embeddings concurrently.
+
+        A healthy result is reused for ``settings.health_ttl_s`` seconds so
+        frequently scraped health endpoints don't hit OpenSearch and Bedrock on
+        every call; unhealthy results are never cached.
+        """
+        cached = self._health_cache
+        if cached is not None and time.monotonic() - cached[0] < settings.health_ttl_s:
+            return cached[1]
         health_status = {
             "overall_status": "healthy",
-            "components": {}
+            "components": {"vectorstore": None, "embeddings": None}
         }
-        try:
-            stats = self.document_processor.get_processing_stats()
-            health_status["components"]["vectorstore"] = {
-                "status": "healthy",
-                "total_documents": stats.get("total_documents", 0)
-            }
-        except Exception as e:
-            health_status["components"]["vectorstore"] = {
-                "status": "unhealthy",
-                "error": str(e)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            probes = {
+                pool.submit(self._probe_vectorstore): "vectorstore",
+                pool.submit(self._probe_embeddings): "embeddings"
             }
-            health_status["overall_status"] = "unhealthy"
-        try:
-            # Test embedding generation
-            test_embedding = self.query_agent.embeddings.embed_query("test")
-            health_status["components"]["embeddings"] = {
-                "status": "healthy",
-                "embedding_dimension": len(test_embedding)
-            }
-        except Exception as e:
-            health_status["components"]["embeddings"] = {
-                "status": "unhealthy",
-                "error": str(e)
-            }
-            health_status["overall_status"] = "unhealthy"
+            for future in as_completed(probes):
+                component = probes[future]
+                try:
+                    health_status["components"][component] = {"status": "healthy", **future.result()}
+                except Exception as e:
+                    health_status["components"][component] = {
+                        "status": "unhealthy",
+                        "error": str(e)
+                    }
+                    health_status["overall_status"] = "unhealthy"
+        if health_status["overall_status"] == "healthy":
+            self._health_cache = (time.monotonic(), health_status)
         return health_status
 
+    def _probe_vectorstore(self) -> Dict[str, Any]:
+        stats = self.document_processor.get_processing_stats()
+        # get_processing_stats reports failures in-band; surface them as a failed probe.
+        if "error" in stats:
+            raise RuntimeError(stats["error"])
+        return {"total_documents": stats["total_documents"]}
+
+    def _probe_embeddings(self) -> Dict[str, Any]:
+        # Test embedding generation
+        test_embedding = self.query_agent.embeddings.embed_query("test")
+        return {"embedding_dimension": len(test_embedding)}
+
     def reset_pipeline(self) -> bool:
         try:
             logger.warning("Resetting entire pipeline - this will delete all documents!")
@@ -122,4 +194,14 @@ class RAGPipeline:
             return True
         except Exception as e:
             logger.error(f"Error resetting pipeline: {e}")
-            return False 
\ No newline at end of file
+            return False 
+
+
+@lru_cache(maxsize=1)
+def get_pipeline() -> RAGPipeline:
+    """Build the pipeline once per process and share it across callers.
+
+    The agents (LangChain, boto3, opensearch-py) are only imported here, on the
+    first call, so the API and CLI can import this without loading them.
+    """
+    return RAGPipeline()
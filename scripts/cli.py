@@ -2,11 +2,40 @@
 Command-line interface for the RAG pipeline.
 """
 import click
-import json
+import shlex
+import sys
 from pathlib import Path
 from typing import List
 from loguru import logger
-from models.rag_pipeline import RAGPipeline
+from tqdm import tqdm
+from config.settings import settings
+from models.rag_pipeline import get_pipeline
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+    import json
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, option=(option | orjson.OPT_INDENT_2) if indent else option)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def _dump(obj, path: str):
+    """Write ``obj`` to ``path`` as indented JSON."""
+    Path(path).write_bytes(_dumps(obj, indent=True))
+
+
+def _start_session():
+    """Build the shared pipeline for a long-lived session and warm it in the background."""
+    pipeline = get_pipeline()
+    if settings.warm_on_startup:
+        pipeline.start_warming()
 
 
 @click.group()
@@ -26,11 +55,10 @@ def cli(verbose):
 def query(question, top_k, include_sources, agent_type, output):
     """Query the RAG pipeline with a question."""
     try:
-        pipeline = RAGPipeline()
+        pipeline = get_pipeline()
         result = pipeline.query(question, top_k, include_sources, agent_type=agent_type)
         if output:
-            with open(output, 'w') as f:
-                json.dump(result, f, indent=2)
+            _dump(result, output)
             click.echo(f"Results saved to {output}")
         else:
             click.echo(f"Question: {result['query']}")
@@ -53,7 +81,7 @@ def query(question, top_k, include_sources, agent_type, output):
 def ingest(file_paths, source_names, output):
     """Ingest documents into the RAG pipeline."""
     try:
-        pipeline = RAGPipeline()
+        pipeline = get_pipeline()
         
         # Convert source_names to list if provided
         source_names_list = list(source_names) if source_names else None
@@ -61,8 +89,7 @@ def ingest(file_paths, source_names, output):
         result = pipeline.ingest_documents(list(file_paths), source_names_list)
         
         if output:
-            with open(output, 'w') as f:
-                json.dump(result, f, indent=2)
+            _dump(result, output)
             click.echo(f"Results saved to {output}")
         else:
             click.echo(f"Ingestion completed:")
@@ -86,28 +113,36 @@ def ingest(file_paths, source_names, output):
 def ingest_dir(directory_path, output):
     """Ingest all supported files from a directory."""
     try:
-        pipeline = RAGPipeline()
-        results = pipeline.ingest_directory(directory_path)
-        
-        successful = sum(1 for r in results if r['success'])
-        failed = len(results) - successful
+        pipeline = get_pipeline()
+        successful = failed = 0
+        failures = []
+        out = open(output, 'wb') if output else None
+        try:
+            for r in tqdm(pipeline.ingest_directory_iter(directory_path), desc="Ingesting", unit="file"):
+                if r['success']:
+                    successful += 1
+                else:
+                    failed += 1
+                    failures.append(r)
+                if out:
+                    out.write(_dumps(r) + b"\n")
+        finally:
+            if out:
+                out.close()
         
         if output:
-            with open(output, 'w') as f:
-                json.dump(results, f, indent=2)
-            click.echo(f"Results saved to {output}")
+            click.echo(f"Results saved to {output} (one JSON object per line)")
         else:
             click.echo(f"Directory ingestion completed:")
             click.echo(f"  Directory: {directory_path}")
-            click.echo(f"  Total files: {len(results)}")
+            click.echo(f"  Total files: {successful + failed}")
             click.echo(f"  Successful: {successful}")
             click.echo(f"  Failed: {failed}")
             
             if failed > 0:
                 click.echo("\nFailed files:")
-                for r in results:
-                    if not r['success']:
-                        click.echo(f"  - {r['file_path']}: {r.get('error', 'Unknown error')}")
+                for r in failures:
+                    click.echo(f"  - {r['file_path']}: {r.get('error', 'Unknown error')}")
     
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -121,7 +156,7 @@ def ingest_dir(directory_path, output):
 def batch_query(questions, input_file, top_k, output):
     """Process multiple queries in batch."""
     try:
-        pipeline = RAGPipeline()
+        pipeline = get_pipeline()
         
         # Get questions from file if provided
         if input_file:
@@ -135,8 +170,7 @@ def batch_query(questions, input_file, top_k, output):
         results = pipeline.batch_query(questions, top_k)
         
         if output:
-            with open(output, 'w') as f:
-                json.dump(results, f, indent=2)
+            _dump(results, output)
             click.echo(f"Results saved to {output}")
         else:
             click.echo(f"Batch query completed for {len(questions)} questions:")
@@ -157,7 +191,7 @@ def batch_query(questions, input_file, top_k, output):
 def suggestions(partial_query, max_suggestions):
     """Get query suggestions based on partial input."""
     try:
-        pipeline = RAGPipeline()
+        pipeline = get_pipeline()
         suggestions = pipeline.get_query_suggestions(partial_query, max_suggestions)
         
         click.echo(f"Suggestions for '{partial_query}':")
@@ -173,7 +207,7 @@ def suggestions(partial_query, max_suggestions):
 def analyze(query):
     """Analyze query intent and characteristics."""
     try:
-        pipeline = RAGPipeline()
+        pipeline = get_pipeline()
         analysis = pipeline.analyze_query(query)
         
         click.echo(f"Analysis for '{query}':")
@@ -188,11 +222,11 @@ def analyze(query):
 def stats():
     """Get pipeline statistics."""
     try:
-        pipeline = RAGPipeline()
+        pipeline = get_pipeline()
         stats = pipeline.get_pipeline_stats()
         
         click.echo("Pipeline Statistics:")
-        click.echo(json.dumps(stats, indent=2))
+        click.echo(_dumps(stats, indent=True).decode('utf-8'))
     
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -202,7 +236,7 @@ def stats():
 def health():
     """Check pipeline health."""
     try:
-        pipeline = RAGPipeline()
+        pipeline = get_pipeline()
         health_status = pipeline.health_check()
         
         click.echo("Pipeline Health Check:")
@@ -222,7 +256,7 @@ def health():
 def remove_source(source_name):
     """Remove all documents from a specific source."""
     try:
-        pipeline = RAGPipeline()
+        pipeline = get_pipeline()
         success = pipeline.remove_source(source_name)
         
         if success:
@@ -239,7 +273,7 @@ def remove_source(source_name):
 def reset():
     """Reset the entire pipeline (delete all documents)."""
     try:
-        pipeline = RAGPipeline()
+        pipeline = get_pipeline()
         success = pipeline.reset_pipeline()
         
         if success:
@@ -251,5 +285,37 @@ def reset():
         click.echo(f"Error: {e}", err=True)
 
 
+@cli.command()
+def shell():
+    """Run commands read from stdin (one per line) against a single warm pipeline."""
+    _start_session()
+    for line in sys.stdin:
+        args = shlex.split(line)
+        if not args:
+            continue
+        if args[0] in ('exit', 'quit'):
+            break
+        try:
+            cli.main(args, standalone_mode=False)
+        except click.ClickException as e:
+            e.show()
+        except click.Abort:
+            click.echo("Aborted!", err=True)
+
+
+@cli.command()
+@click.pass_context
+def repl(ctx):
+    """Start an interactive prompt that reuses one warm pipeline for every command."""
+    try:
+        from click_repl import repl as click_repl
+    except ImportError:
+        click.echo("click-repl is not installed; reading commands from stdin instead.", err=True)
+        ctx.invoke(shell)
+        return
+    _start_session()
+    click_repl(ctx.parent or ctx)
+
+
 if __name__ == '__main__':
     cli() 
\ No newline at end of file
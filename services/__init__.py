@@ -4,7 +4,16 @@ Services for the RAG Pipeline.
 This package contains service integrations for external systems.
 """
 
-from .bedrock_service import BedrockService
-from .opensearch_service import OpenSearchService
+__all__ = ["BedrockService", "OpenSearchService"]
 
-__all__ = ["BedrockService", "OpenSearchService"] 
\ No newline at end of file
+
+def __getattr__(name):
+    # Imported on first access so loading a sibling module (e.g. services.api_service)
+    # does not pull in boto3/opensearch-py or the deprecated service modules.
+    if name == "BedrockService":
+        from .bedrock_service import BedrockService
+        return BedrockService
+    if name == "OpenSearchService":
+        from .opensearch_service import OpenSearchService
+        return OpenSearchService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,35 +1,51 @@
 """
 FastAPI service for the RAG pipeline.
 """
+from contextlib import asynccontextmanager
+import anyio.to_thread
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import json
 import tempfile
 import os
 from pathlib import Path
 from loguru import logger
-from models.rag_pipeline import RAGPipeline
 from config.settings import settings
+from models.rag_pipeline import get_pipeline
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the endpoint thread pool and build the pipeline before serving requests."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.api_worker_threads
+    pipeline = await run_in_threadpool(get_pipeline)
+    if settings.warm_on_startup:
+        pipeline.start_warming()
+    yield
 
 # Initialize FastAPI app
 app = FastAPI(
     title="RAG Pipeline API",
     description="Retrieval-Augmented Generation Pipeline with AWS Bedrock and OpenSearch",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Initialize RAG pipeline
-rag_pipeline = RAGPipeline()
+# Uploads are copied to disk in pieces of this size
+_UPLOAD_CHUNK_SIZE = 1 << 20
 
 # Pydantic models for request/response
 class QueryRequest(BaseModel):
@@ -67,20 +83,25 @@ async def root():
     }
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
+def health_check():
     """Health check endpoint."""
-    return rag_pipeline.health_check()
+    return get_pipeline().health_check()
 
 @app.get("/stats")
-async def get_stats():
+def get_stats():
     """Get pipeline statistics."""
-    return rag_pipeline.get_pipeline_stats()
+    return get_pipeline().get_pipeline_stats()
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    """Get query cache hit/miss statistics."""
+    return get_pipeline().get_cache_stats()
 
 @app.post("/query", response_model=QueryResponse)
-async def query(request: QueryRequest):
+def query(request: QueryRequest):
     """Query the RAG pipeline."""
     try:
-        result = rag_pipeline.query(
+        result = get_pipeline().query(
             request.question,
             request.top_k,
             request.include_sources
@@ -91,10 +112,10 @@ async def query(request: QueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/query/batch")
-async def batch_query(request: BatchQueryRequest):
+def batch_query(request: BatchQueryRequest):
     """Process multiple queries in batch."""
     try:
-        results = rag_pipeline.batch_query(request.questions, request.top_k)
+        results = get_pipeline().batch_query(request.questions, request.top_k)
         return {
             "total_queries": len(request.questions),
             "results": results
@@ -104,44 +125,44 @@ async def batch_query(request: BatchQueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/query/with-context")
-async def query_with_context(
+def query_with_context(
     question: str = Form(...),
     context: str = Form(...),
     top_k: int = Form(5)
 ):
     """Query with additional context."""
     try:
-        result = rag_pipeline.query_with_context(question, context, top_k)
+        result = get_pipeline().query_with_context(question, context, top_k)
         return result
     except Exception as e:
         logger.error(f"Error in query with context endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/suggestions")
-async def get_suggestions(partial_query: str, max_suggestions: int = 5):
+def get_suggestions(partial_query: str, max_suggestions: int = 5):
     """Get query suggestions."""
     try:
-        suggestions = rag_pipeline.get_query_suggestions(partial_query, max_suggestions)
+        suggestions = get_pipeline().get_query_suggestions(partial_query, max_suggestions)
         return {"suggestions": suggestions}
     except Exception as e:
         logger.error(f"Error in suggestions endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/analyze-query")
-async def analyze_query(query: str):
+def analyze_query(query: str):
     """Analyze query intent and characteristics."""
     try:
-        analysis = rag_pipeline.analyze_query(query)
+        analysis = get_pipeline().analyze_query(query)
         return {"analysis": analysis}
     except Exception as e:
         logger.error(f"Error in analyze query endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/ingest/files")
-async def ingest_files(request: IngestRequest):
+def ingest_files(request: IngestRequest):
     """Ingest multiple files."""
     try:
-        results = rag_pipeline.ingest_documents(request.file_paths, request.source_names)
+        results = get_pipeline().ingest_documents(request.file_paths, request.source_names)
         return results
     except Exception as e:
         logger.error(f"Error in ingest files endpoint: {e}")
@@ -154,33 +175,47 @@ async def upload_and_ingest(
 ):
     """Upload and ingest a single file."""
     try:
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        # Process the file
-        result = rag_pipeline.ingest_documents([temp_file_path], [source_name or file.filename])
-        
-        # Clean up temporary file
-        os.unlink(temp_file_path)
-        
-        return result
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix)
+        try:
+            # Stream the upload to the temporary file instead of buffering it in memory
+            with temp_file:
+                while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+                    temp_file.write(chunk)
+            
+            # Process the file
+            return await run_in_threadpool(
+                get_pipeline().ingest_documents, [temp_file.name], [source_name or file.filename]
+            )
+        finally:
+            # Clean up temporary file, even if the upload or ingestion failed
+            os.unlink(temp_file.name)
     except Exception as e:
         logger.error(f"Error in upload and ingest endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/ingest/directory")
-async def ingest_directory(directory_path: str):
-    """Ingest all supported files from a directory."""
+def ingest_directory(directory_path: str, stream: bool = False):
+    """Ingest all supported files from a directory.
+
+    With ``stream=true`` the per-file results are sent as NDJSON while the
+    directory is being ingested, instead of in one response at the end.
+    """
+    if stream:
+        if not Path(directory_path).is_dir():
+            raise HTTPException(status_code=404, detail=f"Directory not found: {directory_path}")
+        lines = (
+            json.dumps(jsonable_encoder(result)) + "\n"
+            for result in get_pipeline().ingest_directory_iter(directory_path)
+        )
+        return StreamingResponse(lines, media_type="application/x-ndjson")
     try:
-        results = rag_pipeline.ingest_directory(directory_path)
+        results = get_pipeline().ingest_directory(directory_path)
+        successful = sum(r["success"] for r in results)
         return {
             "directory_path": directory_path,
             "total_files": len(results),
-            "successful": sum(1 for r in results if r["success"]),
-            "failed": sum(1 for r in results if not r["success"]),
+            "successful": successful,
+            "failed": len(results) - successful,
             "results": results
         }
     except Exception as e:
@@ -188,10 +223,10 @@ async def ingest_directory(directory_path: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/sources/{source_name}")
-async def remove_source(source_name: str):
+def remove_source(source_name: str):
     """Remove all documents from a specific source."""
     try:
-        success = rag_pipeline.remove_source(source_name)
+        success = get_pipeline().remove_source(source_name)
         if success:
             return {"message": f"Successfully removed source: {source_name}"}
         else:
@@ -201,10 +236,10 @@ async def remove_source(source_name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/reset")
-async def reset_pipeline():
+def reset_pipeline():
     """Reset the entire pipeline."""
     try:
-        success = rag_pipeline.reset_pipeline()
+        success = get_pipeline().reset_pipeline()
         if success:
             return {"message": "Pipeline reset successfully"}
         else:
@@ -1,16 +1,27 @@
 # DEPRECATED: This file is no longer used. Bedrock is now handled via LangChain's embedding and LLM wrappers.
 # All logic should be migrated to use langchain_community.embeddings.BedrockEmbeddings and related classes.
 
-raise NotImplementedError("This module is deprecated. Use LangChain's BedrockEmbeddings instead.")
-
 """
 AWS Bedrock service for LLM and embedding operations.
 """
-import json
-import boto3
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
+import numpy as np
 from loguru import logger
 from config.settings import settings
+from utils.clients import get_bedrock_client
+
+warnings.warn(
+    "services.bedrock_service is deprecated. Use LangChain's BedrockEmbeddings instead.",
+    DeprecationWarning,
+    stacklevel=2
+)
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    from json import dumps as _json_dumps, loads as _json_loads
 
 
 class BedrockService:
@@ -18,43 +29,52 @@ class BedrockService:
     
     def __init__(self):
         """Initialize Bedrock client."""
-        self.client = boto3.client(
-            'bedrock-runtime',
-            region_name=settings.aws_region,
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key
-        )
+        self.client = get_bedrock_client()
         logger.info("Bedrock service initialized")
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings using Titan embedding model."""
-        embeddings = []
-        
-        for text in texts:
-            try:
-                # Prepare the request body for Titan embedding model
-                request_body = {
-                    "inputText": text
-                }
-                
-                response = self.client.invoke_model(
-                    modelId=settings.bedrock_embedding_model_id,
-                    body=json.dumps(request_body)
-                )
-                
-                response_body = json.loads(response['body'].read())
-                embedding = response_body['embedding']
-                embeddings.append(embedding)
-                
-                logger.debug(f"Generated embedding for text of length {len(text)}")
-                
-            except Exception as e:
-                logger.error(f"Error generating embedding: {e}")
-                raise
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings using Titan embedding model.
+
+        Titan takes one input per request, so requests are issued concurrently
+        (``settings.embedding_concurrency``). Returns a ``(len(texts), dimension)``
+        float32 array whose rows keep the order of ``texts``.
+        """
+        if not texts:
+            return np.empty((0, settings.opensearch_vector_dimension), dtype=np.float32)
+        with ThreadPoolExecutor(max_workers=min(len(texts), settings.embedding_concurrency)) as pool:
+            results = pool.map(self._embed_one, texts)
+            # Size the array from the first response; the model decides the dimension.
+            first = next(results)
+            embeddings = np.empty((len(texts), len(first)), dtype=np.float32)
+            embeddings[0] = first
+            for i, embedding in enumerate(results, start=1):
+                embeddings[i] = embedding
         
+        logger.opt(lazy=True).debug(
+            "Embedded texts of mean length {:.0f}, max {}",
+            lambda: sum(map(len, texts)) / len(texts), lambda: max(map(len, texts))
+        )
         logger.info(f"Generated {len(embeddings)} embeddings")
         return embeddings
     
+    def _embed_one(self, text: str) -> List[float]:
+        try:
+            # Prepare the request body for Titan embedding model
+            request_body = {
+                "inputText": text
+            }
+            
+            response = self.client.invoke_model(
+                modelId=settings.bedrock_embedding_model_id,
+                body=_json_dumps(request_body)
+            )
+            
+            return _json_loads(response['body'].read())['embedding']
+            
+        except Exception as e:
+            logger.error(f"Error generating embedding: {e}")
+            raise
+    
     def generate_response(self, prompt: str, context: str = None, max_tokens: int = None) -> str:
         """Generate response using Claude Sonnet 3."""
         if max_tokens is None:
@@ -86,11 +106,10 @@ Please answer the question based on the provided context. If the context doesn't
             
             response = self.client.invoke_model(
                 modelId=settings.bedrock_model_id,
-                body=json.dumps(request_body)
+                body=_json_dumps(request_body)
             )
             
-            response_body = json.loads(response['body'].read())
-            content = response_body['content'][0]['text']
+            content = _json_loads(response['body'].read())['content'][0]['text']
             
             logger.info(f"Generated response with {len(content)} characters")
             return content
@@ -1,17 +1,32 @@
 # DEPRECATED: This file is no longer used. OpenSearch is now handled via LangChain's vectorstore integrations.
 # All logic should be migrated to use langchain_community.vectorstores.OpenSearchVectorSearch.
 
-raise NotImplementedError("This module is deprecated. Use LangChain's OpenSearchVectorSearch instead.")
-
 """
 OpenSearch service for vector storage and retrieval.
 """
+import warnings
 from opensearchpy import OpenSearch
+from opensearchpy.helpers import bulk
 from typing import List, Dict, Any, Optional
 import json
+import numpy as np
 from loguru import logger
 from config.settings import settings
 
+warnings.warn(
+    "services.opensearch_service is deprecated. Use LangChain's OpenSearchVectorSearch instead.",
+    DeprecationWarning,
+    stacklevel=2
+)
+
+# Documents per _bulk request
+_BULK_CHUNK_SIZE = 500
+
+
+def _as_list(vector) -> List[float]:
+    """Return ``vector`` as a JSON-ready list; lists pass through untouched."""
+    return vector.tolist() if isinstance(vector, np.ndarray) else vector
+
 
 class OpenSearchService:
     """Service for interacting with OpenSearch."""
@@ -51,10 +66,10 @@ class OpenSearchService:
                             "method": {
                                 "name": "hnsw",
                                 "space_type": "cosinesimil",
-                                "engine": "nmslib",
+                                "engine": "lucene",
                                 "parameters": {
-                                    "ef_construction": 128,
-                                    "m": 16
+                                    "ef_construction": settings.hnsw_ef_construction,
+                                    "m": settings.hnsw_m
                                 }
                             }
                         },
@@ -71,8 +86,7 @@ class OpenSearchService:
                 },
                 "settings": {
                     "index": {
-                        "knn": True,
-                        "knn.algo_param.ef_search": 100
+                        "knn": True
                     }
                 }
             }
@@ -84,44 +98,59 @@ class OpenSearchService:
             logger.info(f"Created index: {settings.opensearch_index_name}")
     
     def index_documents(self, documents: List[Dict[str, Any]]) -> bool:
-        """Index documents with their embeddings."""
-        try:
-            for doc in documents:
-                # Prepare document for indexing
-                index_doc = {
+        """Index documents with their embeddings (lists or float32 arrays).
+
+        Documents are sent through the ``_bulk`` API without forcing a refresh;
+        they become searchable on the index's next scheduled refresh.
+        """
+        index = settings.opensearch_index_name
+        actions = (
+            {
+                "_index": index,
+                "_id": doc.get("chunk_id") or None,
+                "_source": {
                     "content": doc["content"],
-                    "content_vector": doc["embedding"],
+                    "content_vector": _as_list(doc["embedding"]),
                     "metadata": doc.get("metadata", {}),
                     "source": doc.get("source", "unknown"),
                     "chunk_id": doc.get("chunk_id", "")
                 }
-                
-                # Index the document
-                self.client.index(
-                    index=settings.opensearch_index_name,
-                    body=index_doc,
-                    id=doc.get("chunk_id", None)
-                )
+            }
+            for doc in documents
+        )
+        try:
+            indexed, _ = bulk(
+                self.client, actions, chunk_size=_BULK_CHUNK_SIZE, request_timeout=60, refresh=False
+            )
             
-            # Refresh index to make documents searchable
-            self.client.indices.refresh(index=settings.opensearch_index_name)
-            logger.info(f"Indexed {len(documents)} documents")
+            logger.info(f"Indexed {indexed} documents")
             return True
             
         except Exception as e:
             logger.error(f"Error indexing documents: {e}")
             return False
     
-    def search_similar(self, query_embedding: List[float], k: int = 5) -> List[Dict[str, Any]]:
-        """Search for similar documents using vector similarity."""
+    def search_similar(self, query_embedding: List[float], k: int = 5,
+                       ef_search: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search for similar documents using vector similarity.
+
+        ``query_embedding`` may be a list or array; it is sent as a unit vector,
+        which leaves cosine scores unchanged. ``ef_search`` sets the HNSW
+        search width for this query (OpenSearch 2.16+), trading recall for
+        latency; the lucene index has no stored default, so it falls back to
+        ``settings.hnsw_ef_search``.
+        """
         try:
+            query_vector = np.asarray(query_embedding, dtype=np.float64)
+            query_vector = query_vector / (np.linalg.norm(query_vector) + 1e-12)
+            
             # Prepare search query
             search_query = {
                 "size": k,
                 "query": {
                     "knn": {
                         "content_vector": {
-                            "vector": query_embedding,
+                            "vector": query_vector.tolist(),
                             "k": k
                         }
                     }
@@ -129,22 +158,21 @@ class OpenSearchService:
                 "_source": ["content", "metadata", "source", "chunk_id"]
             }
             
+            if ef_search is None:
+                ef_search = settings.hnsw_ef_search
+            search_query["query"]["knn"]["content_vector"]["method_parameters"] = {"ef_search": ef_search}
+            
             # Execute search
             response = self.client.search(
                 index=settings.opensearch_index_name,
                 body=search_query
             )
             
-            # Extract results
+            # Extract results; _source already holds just the requested fields, so reuse it
             results = []
             for hit in response["hits"]["hits"]:
-                result = {
-                    "content": hit["_source"]["content"],
-                    "metadata": hit["_source"]["metadata"],
-                    "source": hit["_source"]["source"],
-                    "chunk_id": hit["_source"]["chunk_id"],
-                    "score": hit["_score"]
-                }
+                result = hit["_source"]
+                result["score"] = hit["_score"]
                 results.append(result)
             
             logger.info(f"Found {len(results)} similar documents")
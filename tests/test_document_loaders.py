@@ -0,0 +1,35 @@
+"""
+Tests for the document loaders used by the document processor agent.
+"""
+import sys
+import zipfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from agents.document_processor_agent import _load_docx, _load_html
+
+_DOCUMENT_XML = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+    '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/><w:tab w:val="left" w:pos="1440"/></w:tabs></w:pPr>'
+    '<w:r><w:t>Title</w:t></w:r></w:p>'
+    '<w:p><w:r><w:t>Name</w:t><w:tab/><w:t>Value</w:t></w:r></w:p>'
+    '</w:body></w:document>'
+)
+
+class TestLoadDocx:
+    """Test streaming DOCX text extraction."""
+    def test_tab_stops_are_not_text(self, tmp_path):
+        path = tmp_path / "doc.docx"
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("word/document.xml", _DOCUMENT_XML)
+        assert _load_docx(str(path))[0].page_content == "Title\nName\tValue"
+
+class TestLoadHtml:
+    """Test HTML text extraction."""
+    def test_script_and_style_are_dropped(self, tmp_path):
+        path = tmp_path / "page.html"
+        path.write_text(
+            "<html><head><style>p { color: red; }</style></head><body>"
+            "<p>Hello</p><script>var x = 1;</script><noscript>Enable JS</noscript><p>World</p>"
+            "</body></html>"
+        )
+        assert _load_html(str(path))[0].page_content == "Hello\nWorld"
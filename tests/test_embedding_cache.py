@@ -0,0 +1,35 @@
+"""
+Tests for the persistent chunk-embedding cache.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.embedding_cache import EmbeddingCache, chunk_id, content_hash
+
+class TestEmbeddingCache:
+    """Test content-addressed embedding storage."""
+    def test_round_trip(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path / "emb.sqlite3"))
+        digest = content_hash("chunk")
+        cache.put_many({digest: [0.5, -0.25, 1.0]})
+        assert cache.get_many([digest, content_hash("other")]) == {digest: [0.5, -0.25, 1.0]}
+
+    def test_entries_are_scoped_to_model(self, tmp_path):
+        path = str(tmp_path / "emb.sqlite3")
+        digest = content_hash("chunk")
+        EmbeddingCache(path, model_id="titan-v1").put_many({digest: [0.5, 1.0]})
+        assert EmbeddingCache(path, model_id="titan-v2").get_many([digest]) == {}
+        assert EmbeddingCache(path, model_id="titan-v1").get_many([digest]) == {digest: [0.5, 1.0]}
+
+    def test_home_relative_path(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        EmbeddingCache("~/.cache/rag/emb.sqlite3")
+        assert (tmp_path / ".cache" / "rag" / "emb.sqlite3").exists()
+
+    def test_content_hash_is_stable(self):
+        assert content_hash("chunk") == content_hash("chunk")
+        assert content_hash("chunk") != content_hash("chunk ")
+
+    def test_chunk_id_is_deterministic(self):
+        assert chunk_id("doc.pdf", 0) == chunk_id("doc.pdf", 0)
+        assert chunk_id("doc.pdf", 0) != chunk_id("doc.pdf", 1)
@@ -0,0 +1,70 @@
+"""
+Tests for the query-side caches.
+"""
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.query_cache import CachedQueryEmbeddings, QueryCache
+
+class TestQueryCache:
+    """Test semantic query cache behaviour."""
+    def test_near_duplicate_hit(self):
+        cache = QueryCache(max_size=4, ttl_s=60, threshold=0.97)
+        cache.put([1.0, 0.0, 0.0], {"response": "a"}, namespace="ns")
+        assert cache.get([0.99, 0.01, 0.0], namespace="ns") == {"response": "a"}
+
+    def test_miss_below_threshold_or_other_namespace(self):
+        cache = QueryCache(max_size=4, ttl_s=60, threshold=0.97)
+        cache.put([1.0, 0.0, 0.0], {"response": "a"}, namespace="ns")
+        assert cache.get([0.0, 1.0, 0.0], namespace="ns") is None
+        assert cache.get([1.0, 0.0, 0.0], namespace="other") is None
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_size=2, ttl_s=60)
+        cache.put([1.0, 0.0], "a")
+        cache.put([0.0, 1.0], "b")
+        cache.put([-1.0, 0.0], "c")
+        assert len(cache) == 2
+        assert cache.get([1.0, 0.0]) is None
+
+    def test_expired_entries_are_dropped(self):
+        cache = QueryCache(max_size=2, ttl_s=-1)
+        cache.put([1.0, 0.0], "a")
+        assert cache.get([1.0, 0.0]) is None
+
+    def test_exact_hit_and_stats(self):
+        cache = QueryCache(max_size=4, ttl_s=60)
+        cache.put([1.0, 0.0], "a", namespace="ns", key="what is x?")
+        assert cache.get_exact("what is x?", namespace="ns") == "a"
+        assert cache.get_exact("what is x?", namespace="other") is None
+        assert cache.get([0.0, 1.0], namespace="ns") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_invalidate_rejects_stale_puts(self):
+        cache = QueryCache(max_size=4, ttl_s=60)
+        generation = cache.generation
+        cache.put([1.0, 0.0], "a", key="q")
+        cache.invalidate()
+        cache.put([1.0, 0.0], "stale", key="q", generation=generation)
+        assert len(cache) == 0
+        assert cache.get_exact("q") is None
+
+    def test_quantized_storage(self):
+        for quantization in ("fp16", "int8"):
+            cache = QueryCache(max_size=4, ttl_s=60, threshold=0.97, quantization=quantization)
+            cache.put([0.6, 0.8, 0.0], "a")
+            assert cache.get([0.59, 0.81, 0.0]) == "a"
+            assert cache.get([0.8, -0.6, 0.0]) is None
+
+class TestCachedQueryEmbeddings:
+    """Test memoized query embeddings."""
+    def test_embed_query_is_memoized(self):
+        inner = MagicMock()
+        inner.embed_query.return_value = [0.1, 0.2]
+        embeddings = CachedQueryEmbeddings(inner)
+        assert embeddings.embed_query("q") == [0.1, 0.2]
+        assert embeddings.embed_query("q") == [0.1, 0.2]
+        inner.embed_query.assert_called_once_with("q")
+        assert embeddings.cache_info() == {"size": 1, "hits": 1, "misses": 1}
@@ -8,21 +8,27 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from langchain_core.documents import Document
+from config.settings import settings
 from models.rag_pipeline import RAGPipeline
+from utils.clients import reset_clients
 
 class TestRAGPipeline:
     """Test RAG pipeline functionality (LangChain version)."""
     @pytest.fixture
     def mock_pipeline(self):
-        with patch('agents.document_processor_agent.BedrockEmbeddings'), \
-             patch('agents.document_processor_agent.OpenSearchVectorSearch'), \
-             patch('agents.query_agent.BedrockEmbeddings'), \
-             patch('agents.query_agent.OpenSearchVectorSearch'), \
-             patch('agents.query_agent.RetrievalQA'):
+        reset_clients()
+        with patch.object(settings, 'embedding_cache_path', ""), \
+             patch('utils.clients.boto3'), \
+             patch('utils.clients.BedrockEmbeddings'), \
+             patch('utils.clients.ChatBedrock'), \
+             patch('utils.clients.OpenSearchVectorSearch'), \
+             patch('agents.query_agent.RetrievalQA'), \
+             patch('agents.react_agent.initialize_agent'):
             pipeline = RAGPipeline()
             # Patch vectorstore and embeddings for stats/health
             pipeline.document_processor.vectorstore = MagicMock()
-            pipeline.document_processor.vectorstore._client.count.return_value = {'count': 42}
+            pipeline.document_processor.vectorstore.client.count.return_value = {'count': 42}
             pipeline.query_agent.embeddings.embed_query = MagicMock(return_value=[0.1]*1536)
             return pipeline
 
@@ -40,6 +46,15 @@ class TestRAGPipeline:
         assert health["components"]["vectorstore"]["status"] == "healthy"
         assert health["components"]["embeddings"]["status"] == "healthy"
 
+    def test_unreachable_vectorstore_is_unhealthy_and_not_cached(self, mock_pipeline):
+        count = mock_pipeline.document_processor.vectorstore.client.count
+        count.side_effect = ConnectionError("connection refused")
+        health = mock_pipeline.health_check()
+        assert health["overall_status"] == "unhealthy"
+        assert health["components"]["vectorstore"]["status"] == "unhealthy"
+        count.side_effect = None
+        assert mock_pipeline.health_check()["overall_status"] == "healthy"
+
     def test_get_pipeline_stats(self, mock_pipeline):
         stats = mock_pipeline.get_pipeline_stats()
         assert "vectorstore" in stats
@@ -47,6 +62,51 @@ class TestRAGPipeline:
         assert "settings" in stats
         assert stats["vectorstore"]["total_documents"] == 42
 
+    def test_processing_stats_are_cached(self, mock_pipeline):
+        processor = mock_pipeline.document_processor
+        processor.get_processing_stats()
+        processor.get_processing_stats()
+        assert processor.vectorstore.client.count.call_count == 1
+        processor.remove_source("test_source")
+        processor.get_processing_stats()
+        assert processor.vectorstore.client.count.call_count == 2
+
+    def test_query_is_answered_then_cached(self, mock_pipeline):
+        chain = MagicMock(return_value={"result": "AI is ...", "source_documents": []})
+        mock_pipeline.query_agent._get_qa_chain = MagicMock(return_value=chain)
+        first = mock_pipeline.query("What is AI?")
+        second = mock_pipeline.query("What is AI?")
+        assert first["success"] is True
+        assert second["response"] == "AI is ..."
+        chain.assert_called_once()
+
+    def test_same_named_files_get_distinct_chunk_ids(self, mock_pipeline, tmp_path):
+        processor = mock_pipeline.document_processor
+        processor._embed_chunks = MagicMock(return_value=[[0.1], [0.2]])
+        processor._bulk_index = MagicMock()
+        paths = [str(tmp_path / "a" / "readme.txt"), str(tmp_path / "b" / "readme.txt")]
+        parsed = [(0, [Document(page_content="first")]), (1, [Document(page_content="second")])]
+        results = processor.index_chunks(parsed, paths, ["readme.txt", "readme.txt"])
+        assert all(result["success"] for result in results.values())
+        ids = [call.args[0][0] for call in processor._bulk_index.call_args_list]
+        assert len(set(ids)) == 2
+        # Each file's leftover chunks from a longer earlier version are deleted
+        assert processor.vectorstore.client.delete_by_query.call_count == 2
+
+    def test_warm_fetches_index_mapping(self, mock_pipeline):
+        mock_pipeline.warm()
+        vectorstore = mock_pipeline.document_processor.vectorstore
+        vectorstore.client.indices.get_mapping.assert_called_once_with(index=vectorstore.index_name)
+
+    def test_embedding_fans_out_across_workers(self, mock_pipeline):
+        processor = mock_pipeline.document_processor
+        processor.embeddings = MagicMock()
+        processor.embeddings.embed_documents.side_effect = lambda batch: [[float(len(t))] for t in batch]
+        texts = ["x" * n for n in range(1, 21)]
+        with patch.object(settings, 'embedding_concurrency', 8):
+            assert processor._embed_texts(texts) == [[float(n)] for n in range(1, 21)]
+        assert processor.embeddings.embed_documents.call_count == 7
+
     def test_remove_source(self, mock_pipeline):
         # Patch remove_source to always return True
         mock_pipeline.document_processor.remove_source = MagicMock(return_value=True)
@@ -0,0 +1,36 @@
+"""
+Tests for the text processing utilities.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.text_processing import _SPECIAL_CHARS, clean_text, split_text_into_chunks
+
+class TestCleanText:
+    """Test text cleaning."""
+    def test_collapses_whitespace_and_drops_specials(self):
+        assert clean_text("  Hello,\t world @ #1 (ok)\n") == "Hello, world  1 (ok)"
+
+    def test_ascii_fast_path_matches_regex(self):
+        text = "".join(chr(code) for code in range(128))
+        assert clean_text(text) == _SPECIAL_CHARS.sub("", " ".join(text.split())).strip()
+
+    def test_long_ascii_text_matches_regex(self):
+        text = "".join(chr(code) for code in range(128)) * 64
+        assert clean_text(text) == _SPECIAL_CHARS.sub("", " ".join(text.split())).strip()
+
+    def test_keeps_unicode_word_characters(self):
+        assert clean_text("héllo wörld ✓ 3²") == "héllo wörld  3²"
+
+class TestSplitTextIntoChunks:
+    """Test overlapping chunking."""
+    def test_chunks_overlap_by_configured_amount(self):
+        text = "".join(chr(ord("a") + i % 26) for i in range(2500))
+        chunks = split_text_into_chunks(text, chunk_size=1000, chunk_overlap=200)
+        assert [len(c) for c in chunks] == [1000, 1000, 900]
+        assert chunks[0][-200:] == chunks[1][:200]
+        assert chunks[-1] == text[1600:]
+
+    def test_short_and_empty_text(self):
+        assert split_text_into_chunks("short text", chunk_size=100, chunk_overlap=20) == ["short text"]
+        assert split_text_into_chunks("   ", chunk_size=100, chunk_overlap=20) == []
@@ -0,0 +1,42 @@
+"""
+Optional Numba kernel for ``clean_text`` on ASCII input.
+
+Importing this module raises ``ImportError`` when numba is not installed;
+``utils.text_processing`` then keeps its pure-Python path.
+"""
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def clean_ascii_bytes(buf, keep, whitespace):
+    """Collapse whitespace runs to one space and drop bytes not in ``keep``, in one pass.
+
+    A pending space is only emitted before the next non-whitespace byte, so
+    leading and trailing whitespace never reach the output.
+    """
+    out = np.empty(buf.size, dtype=np.uint8)
+    n = 0
+    pending = False
+    for b in buf:
+        if whitespace[b]:
+            pending = n > 0
+            continue
+        if pending:
+            out[n] = 32
+            n += 1
+            pending = False
+        if keep[b]:
+            out[n] = b
+            n += 1
+    return out[:n]
+
+
+def build_tables(drop):
+    """Return ``(keep, whitespace)`` 256-entry lookup tables for an ASCII drop set."""
+    keep = np.ones(256, dtype=np.bool_)
+    keep[list(drop)] = False
+    whitespace = np.zeros(256, dtype=np.bool_)
+    whitespace[[code for code in range(128) if chr(code).isspace()]] = True
+    return keep, whitespace
+
@@ -0,0 +1,88 @@
+"""
+Shared AWS Bedrock and OpenSearch clients for the RAG pipeline agents.
+
+Agents are cheap to construct because they all reuse the same process-wide
+clients instead of re-resolving credentials and re-opening connection pools.
+"""
+from functools import lru_cache
+import boto3
+from botocore.config import Config
+from langchain_aws import ChatBedrock
+from langchain_community.embeddings import BedrockEmbeddings
+from langchain_community.vectorstores import OpenSearchVectorSearch
+from config.settings import settings
+from utils.query_cache import CachedQueryEmbeddings
+
+# boto3 clients are thread-safe; size the pool for the ingestion/embedding thread pools.
+_MAX_POOL_CONNECTIONS = 32
+
+
+@lru_cache(maxsize=1)
+def get_boto3_session() -> boto3.Session:
+    """Return the shared boto3 session, so credentials are resolved once per process."""
+    return boto3.Session(
+        region_name=settings.aws_region,
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key
+    )
+
+
+@lru_cache(maxsize=1)
+def get_bedrock_client():
+    """Return the shared ``bedrock-runtime`` client."""
+    return get_boto3_session().client(
+        'bedrock-runtime',
+        config=Config(
+            max_pool_connections=_MAX_POOL_CONNECTIONS,
+            # Adaptive mode rate-limits client-side and backs off on ThrottlingException,
+            # which concurrent embedding batches hit routinely.
+            retries={"mode": "adaptive", "max_attempts": 10}
+        )
+    )
+
+
+@lru_cache(maxsize=1)
+def get_embeddings() -> CachedQueryEmbeddings:
+    """Return the shared Titan embeddings, with query embeddings memoized."""
+    return CachedQueryEmbeddings(
+        BedrockEmbeddings(client=get_bedrock_client(), model_id=settings.bedrock_embedding_model_id),
+        maxsize=settings.query_cache_size
+    )
+
+
+@lru_cache(maxsize=1)
+def get_llm() -> ChatBedrock:
+    """Return the shared Claude chat model."""
+    return ChatBedrock(
+        client=get_bedrock_client(),
+        model_id=settings.bedrock_model_id,
+        model_kwargs={"max_tokens": settings.max_tokens, "temperature": settings.temperature}
+    )
+
+
+@lru_cache(maxsize=1)
+def get_vectorstore() -> OpenSearchVectorSearch:
+    """Return the shared OpenSearch vectorstore (one keep-alive connection pool)."""
+    scheme = "https" if settings.opensearch_use_ssl else "http"
+    auth = None
+    if settings.opensearch_username and settings.opensearch_password:
+        auth = (settings.opensearch_username, settings.opensearch_password)
+    return OpenSearchVectorSearch(
+        opensearch_url=f"{scheme}://{settings.opensearch_host}:{settings.opensearch_port}",
+        index_name=settings.opensearch_index_name,
+        embedding_function=get_embeddings(),
+        http_auth=auth,
+        use_ssl=settings.opensearch_use_ssl,
+        verify_certs=settings.opensearch_use_ssl,
+        pool_maxsize=_MAX_POOL_CONNECTIONS,
+        http_compress=True
+    )
+
+
+def reset_clients():
+    """Drop the shared clients so the next accessor call rebuilds them."""
+    get_vectorstore.cache_clear()
+    get_llm.cache_clear()
+    get_embeddings.cache_clear()
+    get_bedrock_client.cache_clear()
+    get_boto3_session.cache_clear()
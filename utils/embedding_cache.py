@@ -0,0 +1,91 @@
+"""
+Persistent, content-addressed cache of document-chunk embeddings.
+"""
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence
+import numpy as np
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # blake3 is optional; blake2b is always available
+    _blake3 = None
+
+try:
+    from xxhash import xxh3_64_hexdigest as _xxh3_64_hexdigest
+except ImportError:  # xxhash is optional; blake2b is always available
+    _xxh3_64_hexdigest = None
+
+# SQLite's default limit on host parameters per statement is 999.
+_SQLITE_BATCH = 500
+
+
+def content_hash(text: str) -> bytes:
+    """Return a 32-byte digest of ``text`` (blake3 when installed, blake2b otherwise)."""
+    data = text.encode("utf-8")
+    if _blake3 is not None:
+        return _blake3(data).digest()
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+
+def chunk_id(file_path: str, index: int) -> str:
+    """Return a deterministic document ID for chunk ``index`` of the file at ``file_path``.
+
+    Pass the resolved path: files that merely share a name get distinct IDs,
+    while re-ingesting the same file overwrites its chunks in place.
+    """
+    data = f"{file_path}:{index}".encode("utf-8")
+    if _xxh3_64_hexdigest is not None:
+        return _xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite table mapping chunk content hashes to embeddings.
+
+    Entries are keyed by ``model_id`` as well as content, so switching embedding
+    models never serves vectors from the previous model. Vectors are stored as
+    float16 bytes to halve disk I/O and are widened back to float32 on load.
+    """
+
+    def __init__(self, path: str, model_id: str = ""):
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.model_id = model_id
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunk_embeddings ("
+            "model TEXT NOT NULL, hash BLOB NOT NULL, embedding BLOB NOT NULL, PRIMARY KEY (model, hash))"
+        )
+        self._conn.commit()
+
+    def get_many(self, hashes: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        """Return the cached embeddings for whichever of ``hashes`` are present."""
+        unique = list(dict.fromkeys(hashes))
+        found = {}
+        with self._lock:
+            for start in range(0, len(unique), _SQLITE_BATCH):
+                batch = unique[start:start + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, embedding FROM chunk_embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    [self.model_id, *batch]
+                )
+                for digest, blob in rows:
+                    found[digest] = np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+        return found
+
+    def put_many(self, embeddings: Dict[bytes, Sequence[float]]):
+        """Store embeddings keyed by content hash; existing entries are kept."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO chunk_embeddings (model, hash, embedding) VALUES (?, ?, ?)",
+                (
+                    (self.model_id, digest, np.asarray(vector, dtype=np.float16).tobytes())
+                    for digest, vector in embeddings.items()
+                )
+            )
+            self._conn.commit()
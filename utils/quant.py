@@ -0,0 +1,25 @@
+"""
+Scalar quantization helpers for in-memory embedding storage.
+"""
+from typing import Tuple
+import numpy as np
+
+QUANTIZATION_DTYPES = {"fp32": np.float32, "fp16": np.float16, "int8": np.int8}
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetrically quantize ``vectors`` to int8 along the last axis.
+
+    Returns ``(codes, scale)`` with ``vectors ~= codes * scale``, where ``scale``
+    is ``max(|x|) / 127`` per vector (a scalar for a 1-D input).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scale = np.max(np.abs(vectors), axis=-1, keepdims=True) / 127.0
+    scale = np.where(scale == 0, 1.0, scale).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8)
+    return codes, scale.squeeze(-1)
+
+
+def dequantize_int8(codes: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """Inverse of :func:`quantize_int8`."""
+    return codes.astype(np.float32) * np.asarray(scale, dtype=np.float32)[..., None]
@@ -0,0 +1,202 @@
+"""
+Query-side caching utilities for the RAG pipeline.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from utils.quant import QUANTIZATION_DTYPES, quantize_int8
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """Embeddings wrapper that memoizes ``embed_query`` so repeated questions skip the Bedrock round-trip."""
+
+    def __init__(self, embeddings: Embeddings, maxsize: int = 2048):
+        self.embeddings = embeddings
+        self._cached_embed_query = lru_cache(maxsize=maxsize)(self._embed_query)
+
+    def _embed_query(self, text: str) -> Tuple[float, ...]:
+        return tuple(self.embeddings.embed_query(text))
+
+    def embed_query(self, text: str) -> List[float]:
+        return list(self._cached_embed_query(text))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def cache_clear(self):
+        self._cached_embed_query.cache_clear()
+
+    def cache_info(self) -> Dict[str, int]:
+        info = self._cached_embed_query.cache_info()
+        return {"size": info.currsize, "hits": info.hits, "misses": info.misses}
+
+
+class QueryCache:
+    """LRU + TTL cache of query responses, looked up by exact text or embedding similarity.
+
+    Unit embeddings live in one preallocated, C-contiguous float32 matrix with
+    per-row namespace, timestamp and entry-id arrays, so a lookup is a single
+    BLAS matrix-vector product over the occupied rows followed by a namespace
+    mask, rather than a Python loop over entries. ``quantization`` may store the
+    matrix as ``"fp16"`` (half the memory) or ``"int8"`` with a per-row scale (a
+    quarter), at the cost of widening the rows back to float32 on each lookup.
+
+    ``get_exact`` matches the query text itself; ``get`` returns the best
+    response whose embedding has cosine similarity of at least ``threshold`` with
+    the query. Both are restricted to the same namespace (e.g. index and
+    ``top_k``) so responses built for different retrieval settings never mix.
+
+    ``invalidate`` drops every entry and bumps ``generation``; a ``put`` made with
+    an older generation (a response computed before the corpus changed) is ignored.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl_s: float = 600.0, threshold: float = 0.97,
+                 quantization: str = "fp32"):
+        if quantization not in QUANTIZATION_DTYPES:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        self.max_size = max_size
+        self.quantization = quantization
+        self.ttl_s = ttl_s
+        self.threshold = threshold
+        self.generation = 0
+        # entry id -> (row, namespace, response, key), in LRU order
+        self._entries: "OrderedDict[int, Tuple[int, Hashable, Any, Hashable]]" = OrderedDict()
+        self._exact: Dict[Tuple[Hashable, Hashable], int] = {}
+        self._namespace_ids: Dict[Hashable, int] = {}
+        self._matrix: Optional[np.ndarray] = None  # allocated on first put, once the dimension is known
+        self._row_namespace = np.full(max_size, -1, dtype=np.int32)  # -1 marks a free row
+        self._row_time = np.zeros(max_size, dtype=np.float64)
+        self._row_entry = np.zeros(max_size, dtype=np.int64)
+        self._row_scale = np.ones(max_size, dtype=np.float32)  # int8 dequantization scale
+        self._free_rows = list(range(max_size - 1, -1, -1))  # lowest rows are handed out first
+        self._next_id = 0
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.RLock()  # queries may be served from worker threads
+
+    def get_exact(self, key: Hashable, namespace: Hashable = None) -> Optional[Any]:
+        """Return the cached response for exactly ``key`` (e.g. the query text), or ``None``.
+
+        Only hits are counted, since a miss here is followed by a similarity ``get``.
+        """
+        with self._lock:
+            entry_id = self._exact.get((namespace, key))
+            if entry_id is None:
+                return None
+            if self._row_time[self._entries[entry_id][0]] < time.monotonic() - self.ttl_s:
+                self._remove(entry_id)
+                self._evictions += 1
+                return None
+            self._entries.move_to_end(entry_id)
+            self._hits += 1
+            return self._entries[entry_id][2]
+
+    def get(self, embedding: List[float], namespace: Hashable = None) -> Optional[Any]:
+        """Return the cached response for a near-duplicate query, or ``None``."""
+        query = self._normalize(embedding)
+        with self._lock:
+            namespace_id = self._namespace_ids.get(namespace)
+            if namespace_id is None or self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                self._misses += 1
+                return None
+            live = self._row_namespace == namespace_id
+            expired = live & (self._row_time < time.monotonic() - self.ttl_s)
+            if expired.any():
+                for row in np.flatnonzero(expired):
+                    self._remove(int(self._row_entry[row]))
+                    self._evictions += 1
+                live &= ~expired
+            if not live.any():
+                self._misses += 1
+                return None
+            # Only multiply the rows up to the last live one; freed rows are reused first.
+            used = int(np.flatnonzero(live)[-1]) + 1
+            if self.quantization == "fp32":
+                scores = self._matrix[:used] @ query
+            else:
+                scores = self._matrix[:used].astype(np.float32) @ query
+                if self.quantization == "int8":
+                    scores *= self._row_scale[:used]
+            scores[~live[:used]] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self._misses += 1
+                return None
+            entry_id = int(self._row_entry[best])
+            self._entries.move_to_end(entry_id)
+            self._hits += 1
+            return self._entries[entry_id][2]
+
+    def put(self, embedding: List[float], response: Any, namespace: Hashable = None,
+            key: Hashable = None, generation: Optional[int] = None):
+        """Insert a response, evicting the least recently used entry when full.
+
+        Pass the ``generation`` read before computing ``response`` so results that
+        raced with an ``invalidate`` are not cached.
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+                self.clear()
+                self._matrix = np.zeros((self.max_size, vector.shape[0]), dtype=QUANTIZATION_DTYPES[self.quantization])
+            if key is not None and (namespace, key) in self._exact:
+                self._remove(self._exact[(namespace, key)])
+            if not self._free_rows:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+            row = self._free_rows.pop()
+            entry_id = self._next_id
+            self._next_id += 1
+            if self.quantization == "int8":
+                self._matrix[row], self._row_scale[row] = quantize_int8(vector)
+            else:
+                self._matrix[row] = vector
+            self._row_namespace[row] = self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+            self._row_time[row] = time.monotonic()
+            self._row_entry[row] = entry_id
+            self._entries[entry_id] = (row, namespace, response, key)
+            if key is not None:
+                self._exact[(namespace, key)] = entry_id
+
+    def invalidate(self):
+        """Drop all entries because the underlying corpus changed."""
+        with self._lock:
+            self.generation += 1
+            self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._exact.clear()
+            self._row_namespace.fill(-1)
+            self._free_rows = list(range(self.max_size - 1, -1, -1))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "generation": self.generation,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, entry_id: int):
+        row, namespace, _, key = self._entries.pop(entry_id)
+        self._row_namespace[row] = -1
+        self._free_rows.append(row)
+        if key is not None and self._exact.get((namespace, key)) == entry_id:
+            del self._exact[(namespace, key)]
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) + 1e-12)
@@ -2,60 +2,91 @@
 Text processing utilities for the RAG pipeline.
 """
 import re
+from functools import lru_cache
 from typing import List, Dict, Any
+import numpy as np
 from loguru import logger
 from config.settings import settings
 
+_KEEP_PUNCTUATION = frozenset('_.,!?;:-()[]{}')
+# Characters clean_text removes: anything but word characters, whitespace and the punctuation above.
+# Matching whole runs means one replacement per run instead of one per character.
+_SPECIAL_CHARS = re.compile(r'[^\w\s.,!?;:\-()\[\]{}]+')
+# Same filter as a str.translate table over ASCII (str.isalnum/isspace match re's \w/\s).
+_ASCII_DROP = {
+    code: None for code in range(128)
+    if not (chr(code).isalnum() or chr(code).isspace() or chr(code) in _KEEP_PUNCTUATION)
+}
+# Below this length the Numba call overhead outweighs its single fused pass.
+_NUMBA_MIN_LENGTH = 4096
+
+
+@lru_cache(maxsize=1)
+def _numba_cleaner():
+    """Load the optional Numba kernel on first use; ``None`` when numba is not installed.
+
+    Deferred so importing ``utils`` doesn't pay numba's import cost; the compiled
+    kernel is cached on disk, so JIT compilation happens once per install.
+    """
+    try:
+        from utils import _text_numba
+    except ImportError:
+        return None
+    keep, whitespace = _text_numba.build_tables(_ASCII_DROP)
+    return lambda buf: _text_numba.clean_ascii_bytes(buf, keep, whitespace)
+
 
 def clean_text(text: str) -> str:
     """Clean and normalize text."""
+    if len(text) >= _NUMBA_MIN_LENGTH and text.isascii() and _numba_cleaner() is not None:
+        buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        return _numba_cleaner()(buf).tobytes().decode('ascii').strip()
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = ' '.join(text.split())
     # Remove special characters but keep punctuation
-    text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}]', '', text)
+    if text.isascii():
+        text = text.translate(_ASCII_DROP)
+    else:
+        text = _SPECIAL_CHARS.sub('', text)
     return text.strip()
 
 
-def split_text_into_chunks(text: str, chunk_size: int = None, chunk_overlap: int = None) -> List[str]:
-    """Split text into overlapping chunks."""
+def split_text_into_chunks(text: str, chunk_size: int = None, chunk_overlap: int = None, clean: bool = True) -> List[str]:
+    """Split text into overlapping chunks.
+
+    Chunks start every ``chunk_size - chunk_overlap`` characters, so consecutive
+    chunks share ``chunk_overlap`` characters. The text is cleaned once up front;
+    pass ``clean=False`` if it already went through :func:`clean_text`.
+    """
     if chunk_size is None:
         chunk_size = settings.chunk_size
     if chunk_overlap is None:
         chunk_overlap = settings.chunk_overlap
+    if clean:
+        text = clean_text(text)
+    if not text:
+        return []
     
-    chunks = []
-    start = 0
-    
-    while start < len(text):
-        end = start + chunk_size
-        
-        # If this is not the first chunk, include some overlap
-        if start > 0:
-            start = start - chunk_overlap
-        
-        # Extract the chunk
-        chunk = text[start:end]
-        
-        # Clean the chunk
-        chunk = clean_text(chunk)
-        
-        if chunk:
-            chunks.append(chunk)
-        
-        # Move to next chunk
-        start = end
+    step = max(1, chunk_size - chunk_overlap)
+    starts = range(0, max(len(text) - chunk_overlap, 1), step)
+    chunks = [chunk for chunk in (text[i:i + chunk_size].strip() for i in starts) if chunk]
     
-    logger.info(f"Split text into {len(chunks)} chunks")
+    logger.debug("Split text into {} chunks", len(chunks))
     return chunks
 
 
-def extract_metadata(text: str, source: str = None) -> Dict[str, Any]:
-    """Extract metadata from text."""
+def extract_metadata(text: str, source: str = None, chunk_count: int = None) -> Dict[str, Any]:
+    """Extract metadata from text.
+
+    Pass ``chunk_count`` when the text has already been chunked to avoid splitting it again.
+    """
+    if chunk_count is None:
+        chunk_count = len(split_text_into_chunks(text))
     metadata = {
         "source": source,
         "length": len(text),
         "word_count": len(text.split()),
-        "chunk_count": len(split_text_into_chunks(text))
+        "chunk_count": chunk_count
     }
     return metadata
 
@@ -66,10 +97,10 @@ def preprocess_document(text: str, source: str = None) -> Dict[str, Any]:
     cleaned_text = clean_text(text)
     
     # Split into chunks
-    chunks = split_text_into_chunks(cleaned_text)
+    chunks = split_text_into_chunks(cleaned_text, clean=False)
     
     # Extract metadata
-    metadata = extract_metadata(cleaned_text, source)
+    metadata = extract_metadata(cleaned_text, source, chunk_count=len(chunks))
     
     return {
         "original_text": text,